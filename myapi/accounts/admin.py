@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django import forms
 
+from common.admin import ChangelistQuerysetMixin
+
 from .models import OneTimePassword, User
 
 
@@ -46,13 +48,16 @@ class UserCreationNoPasswordForm(forms.ModelForm):
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(ChangelistQuerysetMixin, BaseUserAdmin):
     add_form = UserCreationNoPasswordForm
 
     ordering = ("email",)
     list_display = ("email", "username", "role", "is_active", "is_staff")
     search_fields = ("email", "username", "phone")
     list_filter = ("role", "is_active", "is_staff")
+    # The changelist only renders local columns; the change form still
+    # loads the full row through get_object().
+    changelist_only = ("id", "email", "username", "role", "is_active", "is_staff")
     readonly_fields = (
         "last_login_at",
         "last_logout_at",
@@ -100,9 +105,16 @@ class UserAdmin(BaseUserAdmin):
         ),
     )
 
+    def get_fieldsets(self, request, obj=None):
+        # Both layouts are static; skip the base class' dynamic resolution.
+        return self.add_fieldsets if obj is None else self.fieldsets
+
 
 @admin.register(OneTimePassword)
-class OneTimePasswordAdmin(admin.ModelAdmin):
+class OneTimePasswordAdmin(ChangelistQuerysetMixin, admin.ModelAdmin):
     list_display = ("user", "purpose", "code", "created_at", "expires_at", "is_used")
     list_filter = ("purpose", "is_used", "created_at")
     search_fields = ("user__email", "code")
+    list_select_related = ("user",)
+    # Only the columns the changelist renders (User.__str__ is the email).
+    changelist_only = ("id", "purpose", "code", "created_at", "expires_at", "is_used", "user__email")
@@ -1,12 +1,80 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework.authentication import CSRFCheck
 from rest_framework import exceptions
 
 
+class _TTLCache:
+    """
+    Small thread-safe LRU whose entries carry their own expiry timestamp.
+    Kept in-process on purpose: entries are live objects (validated tokens)
+    that should never be pickled or shared across workers.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires_at: float):
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_verified_tokens = _TTLCache(maxsize=10_000)
+_users = _TTLCache(maxsize=5_000)
+
+
+def _dummy_get_response(request):
+    return None
+
+
+# CsrfViewMiddleware keeps no per-request state, so one instance serves every
+# request (same construction DRF's SessionAuthentication uses).
+_csrf_check = CSRFCheck(_dummy_get_response)
+
+
+def _token_cache_key(raw_token) -> bytes:
+    # Never key on the raw token itself.
+    if isinstance(raw_token, str):
+        raw_token = raw_token.encode()
+    return hashlib.blake2b(raw_token, digest_size=16).digest()
+
+
 class CookieJWTAuthentication(JWTAuthentication):
     """
-    Extension of JWTAuthentication that looks for the token inside the 
+    Extension of JWTAuthentication that looks for the token inside the
     HttpOnly `access` cookie and enforces CSRF protection.
+
+    When ``settings.JWT_VERIFICATION_CACHE_TTL`` is a positive number of
+    seconds, successfully verified tokens are remembered for that long (and
+    never past their own ``exp``) so repeat requests skip signature checks.
+
+    Likewise, ``settings.JWT_USER_CACHE_TTL`` keeps the authenticated user
+    row in memory for a few seconds instead of fetching it on every request.
     """
 
     def authenticate(self, request):
@@ -23,16 +91,47 @@ class CookieJWTAuthentication(JWTAuthentication):
         if header is None:
             self.enforce_csrf(request)
 
-        validated_token = self.get_validated_token(raw_token)
+        validated_token = self._get_cached_validated_token(raw_token)
         return self.get_user(validated_token), validated_token
 
+    def _get_cached_validated_token(self, raw_token):
+        ttl = getattr(settings, "JWT_VERIFICATION_CACHE_TTL", 0)
+        if not ttl:
+            return self.get_validated_token(raw_token)
+
+        key = _token_cache_key(raw_token)
+        validated_token = _verified_tokens.get(key)
+        if validated_token is None:
+            validated_token = self.get_validated_token(raw_token)
+            expires_at = time.time() + ttl
+            token_exp = validated_token.get("exp")
+            if token_exp is not None:
+                expires_at = min(expires_at, token_exp)
+            _verified_tokens.set(key, validated_token, expires_at)
+        return validated_token
+
+    def get_user(self, validated_token):
+        ttl = getattr(settings, "JWT_USER_CACHE_TTL", 0)
+        if not ttl:
+            return super().get_user(validated_token)
+
+        key = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = _users.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            _users.set(key, user, time.time() + ttl)
+        # Hand each request its own instance so in-view mutations never leak
+        # into the shared cache entry.
+        return copy.copy(user)
+
     def enforce_csrf(self, request):
         """
         Enforce CSRF validation for cookie-based authentication.
+
+        Only the cookie path calls this: clients sending the token in the
+        Authorization header cannot be driven cross-site, so they skip it.
         """
-        check = CSRFCheck(request)
-        check.process_request(request)
-        reason = check.process_view(request, None, (), {})
+        _csrf_check.process_request(request)
+        reason = _csrf_check.process_view(request, None, (), {})
         if reason:
             raise exceptions.PermissionDenied(f'CSRF Failed: {reason}')
-
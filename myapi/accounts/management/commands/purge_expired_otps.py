@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.models import OneTimePassword
+
+
+class Command(BaseCommand):
+    help = 'Delete one-time passwords that expired more than --days days ago. Intended to run hourly from cron.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=1, help='Keep expired OTPs for this many days (default: 1).')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        # Served by the expires_at index; keeps the OTP table (and its live
+        # partial index) bounded regardless of historical volume.
+        deleted, _ = OneTimePassword.objects.filter(expires_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} expired OTPs."))
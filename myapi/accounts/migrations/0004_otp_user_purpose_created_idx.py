@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_notification_related_id_notification_type'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='onetimepassword',
+            name='accounts_on_user_id_50ccd3_idx',
+        ),
+        migrations.AddIndex(
+            model_name='onetimepassword',
+            index=models.Index(condition=models.Q(('is_used', False)), fields=['user', 'purpose', '-created_at'], name='otp_user_purpose_created_idx'),
+        ),
+    ]
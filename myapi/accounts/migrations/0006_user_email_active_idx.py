@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-16 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_email_upper_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email', 'is_active'], name='user_email_active_idx'),
+        ),
+    ]
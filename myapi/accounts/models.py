@@ -1,7 +1,9 @@
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import PermissionsMixin
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 
 
@@ -93,6 +95,19 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
 
+    class Meta:
+        indexes = [
+            # Postgres compiles ``email__iexact`` to UPPER(email) = UPPER(%s).
+            models.Index(Upper("email"), name="user_email_upper_idx"),
+            # Lets the password-reset lookup be answered by an index-only scan.
+            models.Index(fields=["email", "is_active"], name="user_email_active_idx"),
+            # Trigram indexes for the admin search box (``icontains`` compiles
+            # to UPPER(col) LIKE UPPER('%q%'), hence the Upper() expressions).
+            GinIndex(OpClass(Upper("email"), name="gin_trgm_ops"), name="user_email_trgm"),
+            GinIndex(OpClass(Upper("username"), name="gin_trgm_ops"), name="user_username_trgm"),
+            GinIndex(OpClass(Upper("phone"), name="gin_trgm_ops"), name="user_phone_trgm"),
+        ]
+
     def __str__(self):
         return self.email
 
@@ -114,7 +129,13 @@ class OneTimePassword(models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=["user", "purpose"]),
+            # Partial, ordered index so OTPService._latest_otp is a single
+            # backward index scan over live codes only.
+            models.Index(
+                fields=["user", "purpose", "-created_at"],
+                name="otp_user_purpose_created_idx",
+                condition=models.Q(is_used=False),
+            ),
             models.Index(fields=["expires_at"]),
         ]
 
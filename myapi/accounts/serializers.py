@@ -2,6 +2,7 @@ from django.contrib.auth import password_validation
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from common.serializers import FastListSerializer
 from .models import OneTimePassword, User, Notification
 
 
@@ -43,7 +44,12 @@ class LoginSerializer(serializers.Serializer):
         try:
             user = User.objects.get(email=email)
         except User.DoesNotExist:
-            raise serializers.ValidationError(_("Unable to log in with provided credentials."))
+            # Emails are stored as entered; fall back to a case-insensitive
+            # match only when it is unambiguous.
+            matches = list(User.objects.filter(email__iexact=email)[:2])
+            if len(matches) != 1:
+                raise serializers.ValidationError(_("Unable to log in with provided credentials."))
+            user = matches[0]
 
         # If the user does not have a usable password yet, they must complete
         # the initial setup flow before being allowed to log in.
@@ -61,7 +67,10 @@ class PasswordResetRequestSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
     def validate_email(self, value):
-        if not User.objects.filter(email=value, is_active=True).exists():
+        # Keep the matched user so the view does not look it up a second time.
+        # OTPService.issue only needs the pk and email.
+        self.user = User.objects.filter(email=value, is_active=True).only("id", "email").first()
+        if self.user is None:
             raise serializers.ValidationError(_("Active account with this email was not found."))
         return value
 
@@ -89,17 +98,19 @@ class ChangePasswordSerializer(serializers.Serializer):
 
     def validate(self, attrs):
         user = self.context["request"].user
-        if not user.check_password(attrs["old_password"]):
-            raise serializers.ValidationError({"old_password": _("Incorrect password.")})
+        # Cheap checks first; check_password runs the (deliberately slow) hasher.
         if attrs["new_password"] != attrs["confirm_new_password"]:
             raise serializers.ValidationError({"confirm_new_password": _("Passwords do not match.")})
         password_validation.validate_password(attrs["new_password"], user)
+        if not user.check_password(attrs["old_password"]):
+            raise serializers.ValidationError({"old_password": _("Incorrect password.")})
         return attrs
 
 
 class ActivityLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
+        list_serializer_class = FastListSerializer
         fields = [
             "email",
             "role",
@@ -116,13 +127,15 @@ class RequestInitialSetupOTPSerializer(serializers.Serializer):
 
     def validate_email(self, value):
         try:
-            user = User.objects.get(email=value)
+            user = User.objects.only("id", "email", "password", "is_active").get(email=value)
         except User.DoesNotExist:
             raise serializers.ValidationError(_("User with this email does not exist."))
 
         if user.has_usable_password() or user.is_active:
             raise serializers.ValidationError(_("Account does not require initial setup."))
 
+        # Reused by the view instead of a second lookup.
+        self.user = user
         return value
 
 
@@ -1,3 +1,4 @@
+import hmac
 import logging
 import secrets
 from dataclasses import dataclass
@@ -6,9 +7,12 @@ from typing import Optional
 
 from django.conf import settings
 from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 
 from .models import OneTimePassword, User
+from .tasks import enqueue, send_otp_email_task
 
 logger = logging.getLogger(__name__)
 
@@ -45,31 +49,44 @@ class OTPService:
     def _latest_otp(cls, user: User, purpose: str) -> Optional[OneTimePassword]:
         return (
             OneTimePassword.objects.filter(user=user, purpose=purpose, is_used=False)
+            .only("id", "created_at", "expires_at", "is_used", "code", "attempt_count")
             .order_by("-created_at")
             .first()
         )
 
     @classmethod
     def issue(cls, user: User, purpose: str) -> OTPResult:
-        now = timezone.now()
-        latest = cls._latest_otp(user, purpose)
-        if latest and latest.created_at + cls.COOLDOWN > now:
-            raise OTPServiceError("OTP recently sent. Please wait before requesting another.")
-
-        if latest and not latest.is_expired():
-            # Invalidate previous OTP so the newest one is the only valid option
-            latest.mark_used()
-
-        # Generate cryptographically secure 5-digit OTP code
-        code = ''.join(secrets.choice('0123456789') for _ in range(cls.OTP_LENGTH))
-        expires_at = now + cls.EXPIRY
-        otp = OneTimePassword.objects.create(
-            user=user,
-            code=code,
-            purpose=purpose,
-            expires_at=expires_at,
-        )
-        EmailService.send_otp_email(user.email, code, purpose)
+        with transaction.atomic():
+            # Serialize concurrent issues for the same user on the user row, so
+            # a racing request waits and then hits the cooldown check instead
+            # of creating (and emailing) a second code.
+            list(User.objects.select_for_update().filter(pk=user.pk).values_list("pk", flat=True))
+
+            now = timezone.now()
+            recently_sent = OneTimePassword.objects.filter(
+                user=user, purpose=purpose, is_used=False, created_at__gt=now - cls.COOLDOWN
+            ).exists()
+            if recently_sent:
+                raise OTPServiceError("OTP recently sent. Please wait before requesting another.")
+
+            # One CSPRNG draw reduced to OTP_LENGTH digits; the modulo bias of
+            # 2**32 % 10**5 is negligible (< 0.0024%).
+            n = int.from_bytes(secrets.token_bytes(4), "big") % 10 ** cls.OTP_LENGTH
+            code = f"{n:0{cls.OTP_LENGTH}d}"
+            expires_at = now + cls.EXPIRY
+
+            # Invalidate previous OTPs so the newest one is the only valid option
+            OneTimePassword.objects.filter(
+                user=user, purpose=purpose, is_used=False
+            ).update(is_used=True)
+            otp = OneTimePassword.objects.create(
+                user=user,
+                code=code,
+                purpose=purpose,
+                expires_at=expires_at,
+            )
+            # SMTP is slow; send once the OTP row is committed, off the request thread.
+            enqueue(send_otp_email_task, user.email, code, purpose)
         return OTPResult(code=code, expires_at=otp.expires_at)
 
     @classmethod
@@ -89,29 +106,46 @@ class OTPService:
                 "Too many failed attempts. Please request a new code."
             )
 
-        otp.attempt_count += 1
-        otp.save(update_fields=["attempt_count"])
-
-        if otp.code != code:
+        # Attempts are counted (and the code consumed) with guarded UPDATEs so
+        # concurrent guesses can neither exceed MAX_ATTEMPTS nor reuse a code.
+        live = OneTimePassword.objects.filter(
+            pk=otp.pk,
+            is_used=False,
+            attempt_count__lt=cls.MAX_ATTEMPTS,
+            expires_at__gt=timezone.now(),
+        )
+        if not hmac.compare_digest(otp.code, code):
+            live.update(attempt_count=F("attempt_count") + 1)
             raise OTPServiceError("Invalid OTP. Please try again.")
 
-        otp.mark_used()
+        if not live.update(is_used=True, attempt_count=F("attempt_count") + 1):
+            raise OTPServiceError("OTP is no longer valid. Please request a new code.")
         return True
 
 
+# (subject, body template) per OTP purpose.
+_OTP_EMAILS = {
+    OneTimePassword.Purpose.INITIAL_SETUP: (
+        "Set up your account password",
+        "Your initial setup code is {code}. It expires in 5 minutes.",
+    ),
+    OneTimePassword.Purpose.PASSWORD_RESET: (
+        "Reset your password",
+        "Your password reset code is {code}. It expires in 5 minutes.",
+    ),
+}
+_DEFAULT_OTP_EMAIL = (
+    "Your verification code",
+    "Your verification code is {code}. It expires in 5 minutes.",
+)
+
+
 class EmailService:
     @staticmethod
-    def send_otp_email(email: str, code: str, purpose: str) -> None:
-        if purpose == OneTimePassword.Purpose.INITIAL_SETUP:
-            subject = "Set up your account password"
-            body = f"Your initial setup code is {code}. It expires in 5 minutes."
-        elif purpose == OneTimePassword.Purpose.PASSWORD_RESET:
-            subject = "Reset your password"
-            body = f"Your password reset code is {code}. It expires in 5 minutes."
-        else:
-            # Fallback for any unexpected purposes
-            subject = "Your verification code"
-            body = f"Your verification code is {code}. It expires in 5 minutes."
+    def send_otp_email(email: str, code: str, purpose: str, connection=None) -> None:
+        # Fallback for any unexpected purposes
+        subject, template = _OTP_EMAILS.get(purpose, _DEFAULT_OTP_EMAIL)
+        body = template.format(code=code)
 
         try:
             send_mail(
@@ -120,6 +154,7 @@ class EmailService:
                 from_email=getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com"),
                 recipient_list=[email],
                 fail_silently=False,
+                connection=connection,
             )
             logger.info(f"OTP email sent successfully to {email} for purpose: {purpose}")
         except Exception as e:
@@ -0,0 +1,82 @@
+"""
+accounts/tasks.py
+
+Background jobs for the accounts app.
+
+There is no task queue in this deployment, so jobs run on a small
+in-process thread pool. They are only submitted once the surrounding
+transaction commits, so a rolled-back request never triggers side effects.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.mail import get_connection
+from django.db import close_old_connections, transaction
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="accounts-tasks")
+
+OTP_EMAIL_MAX_RETRIES = 3
+
+# Each worker thread keeps its own open SMTP connection so consecutive OTP
+# emails skip the TCP + STARTTLS + AUTH handshake.
+_local = threading.local()
+
+
+def enqueue(func, *args, **kwargs) -> None:
+    """Run ``func(*args, **kwargs)`` in the background after commit."""
+    transaction.on_commit(lambda: _executor.submit(_run, func, args, kwargs))
+
+
+def _run(func, args, kwargs) -> None:
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed.", getattr(func, "__name__", func))
+    finally:
+        # Pool threads never see request_finished, so release DB connections here.
+        close_old_connections()
+
+
+def record_logout_task(user_id, logged_out_at) -> None:
+    User.objects.filter(pk=user_id).update(last_logout_at=logged_out_at)
+
+
+def send_otp_email_task(email: str, code: str, purpose: str) -> None:
+    # Imported here: services imports this module to enqueue the task.
+    from .services import EmailService
+
+    for attempt in range(1, OTP_EMAIL_MAX_RETRIES + 1):
+        try:
+            EmailService.send_otp_email(email, code, purpose, connection=_smtp_connection())
+            return
+        except Exception:
+            # The server may have dropped an idle connection; start fresh.
+            _reset_smtp_connection()
+            if attempt == OTP_EMAIL_MAX_RETRIES:
+                raise
+            logger.warning("Retrying OTP email to %s (attempt %s).", email, attempt + 1)
+
+
+def _smtp_connection():
+    connection = getattr(_local, "smtp", None)
+    if connection is None:
+        connection = get_connection()
+        # Opened explicitly so send_messages() leaves it open afterwards.
+        connection.open()
+        _local.smtp = connection
+    return connection
+
+
+def _reset_smtp_connection() -> None:
+    connection = getattr(_local, "smtp", None)
+    _local.smtp = None
+    if connection is not None:
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -1,3 +1,93 @@
+from datetime import timedelta
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+
+from .models import OneTimePassword, User
+from .services import OTPService, OTPServiceError
+
+
+class OTPServiceTests(TestCase):
+    purpose = OneTimePassword.Purpose.PASSWORD_RESET
+
+    def setUp(self):
+        self.user = User.objects.create_user("otp@example.com", "secret-pass-123", is_active=True)
+
+    def _issue(self):
+        return OTPService.issue(self.user, self.purpose)
+
+    def _age_codes(self):
+        # Move every code past the cooldown so a new one may be issued.
+        OneTimePassword.objects.filter(user=self.user).update(
+            created_at=timezone.now() - OTPService.COOLDOWN - timedelta(seconds=1)
+        )
+
+    def test_issue_creates_code_and_emails_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            result = self._issue()
+
+        self.assertEqual(len(result.code), OTPService.OTP_LENGTH)
+        self.assertTrue(result.code.isdigit())
+        otp = OneTimePassword.objects.get(user=self.user, purpose=self.purpose)
+        self.assertEqual(otp.code, result.code)
+        self.assertFalse(otp.is_used)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_issue_within_cooldown_is_rejected(self):
+        self._issue()
+        with self.assertRaisesMessage(OTPServiceError, "recently sent"):
+            self._issue()
+        self.assertEqual(OneTimePassword.objects.filter(user=self.user).count(), 1)
+
+    def test_issue_invalidates_previous_codes(self):
+        first = self._issue()
+        self._age_codes()
+        second = self._issue()
+
+        live = OneTimePassword.objects.filter(user=self.user, is_used=False)
+        self.assertEqual(list(live.values_list("code", flat=True)), [second.code])
+        if first.code != second.code:
+            with self.assertRaises(OTPServiceError):
+                OTPService.verify(self.user, self.purpose, first.code)
+
+    def test_verify_consumes_the_code_once(self):
+        code = self._issue().code
+
+        self.assertTrue(OTPService.verify(self.user, self.purpose, code))
+        otp = OneTimePassword.objects.get(user=self.user)
+        self.assertTrue(otp.is_used)
+        self.assertEqual(otp.attempt_count, 1)
+        with self.assertRaisesMessage(OTPServiceError, "No OTP request found"):
+            OTPService.verify(self.user, self.purpose, code)
+
+    def test_wrong_codes_count_attempts_until_lockout(self):
+        code = self._issue().code
+        wrong = "00000" if code != "00000" else "11111"
+
+        for _ in range(OTPService.MAX_ATTEMPTS):
+            with self.assertRaisesMessage(OTPServiceError, "Invalid OTP"):
+                OTPService.verify(self.user, self.purpose, wrong)
+        self.assertEqual(OneTimePassword.objects.get(user=self.user).attempt_count, OTPService.MAX_ATTEMPTS)
+
+        # Locked out: even the right code is refused now.
+        with self.assertRaisesMessage(OTPServiceError, "Too many failed attempts"):
+            OTPService.verify(self.user, self.purpose, code)
+
+    def test_guarded_update_rejects_a_code_consumed_concurrently(self):
+        code = self._issue().code
+        otp = OTPService._latest_otp(self.user, self.purpose)
+        # Another request consumes the code between the read and the UPDATE.
+        OneTimePassword.objects.filter(pk=otp.pk).update(is_used=True)
+
+        with mock.patch.object(OTPService, "_latest_otp", return_value=otp):
+            with self.assertRaisesMessage(OTPServiceError, "no longer valid"):
+                OTPService.verify(self.user, self.purpose, code)
+
+    def test_expired_code_does_not_use_an_attempt(self):
+        code = self._issue().code
+        OneTimePassword.objects.filter(user=self.user).update(expires_at=timezone.now() - timedelta(seconds=1))
 
-# Create your tests here.
+        with self.assertRaisesMessage(OTPServiceError, "expired"):
+            OTPService.verify(self.user, self.purpose, code)
+        self.assertEqual(OneTimePassword.objects.get(user=self.user).attempt_count, 0)
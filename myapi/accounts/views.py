@@ -3,10 +3,11 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.utils.decorators import method_decorator
-from rest_framework import permissions, status
+from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from .authentication import CookieJWTAuthentication
@@ -23,6 +24,8 @@ from .serializers import (
     UserSerializer,
 )
 from .services import OTPService, OTPServiceError
+from .tasks import enqueue, record_logout_task
+from users.pagination import UserPagination
 from users.permissions import IsAdminRole
 
 # Optimization models are imported here (not inside the view method).
@@ -42,18 +45,33 @@ class CSRFView(APIView):
 
 
 
+# Token lifetimes and cookie flags are static settings; resolve them once.
+ACCESS_MAX_AGE = int(jwt_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+REFRESH_MAX_AGE = int(jwt_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+COMMON_COOKIE_ARGS = {
+    "httponly": True,
+    "samesite": "Lax",
+    "secure": getattr(settings, "SESSION_COOKIE_SECURE", False),
+    "path": "/",
+}
+
+
 def _set_jwt_cookies(response: Response, refresh: RefreshToken):
-    access = refresh.access_token
-    access_exp = int(access.lifetime.total_seconds())
-    refresh_exp = int(refresh.lifetime.total_seconds())
-    common_args = {
-        "httponly": True,
-        "samesite": "Lax",
-        "secure": getattr(settings, "SESSION_COOKIE_SECURE", False),
-        "path": "/",
-    }
-    response.set_cookie("access", str(access), max_age=access_exp, **common_args)
-    response.set_cookie("refresh", str(refresh), max_age=refresh_exp, **common_args)
+    response.set_cookie("access", str(refresh.access_token), max_age=ACCESS_MAX_AGE, **COMMON_COOKIE_ARGS)
+    response.set_cookie("refresh", str(refresh), max_age=REFRESH_MAX_AGE, **COMMON_COOKIE_ARGS)
+
+
+def _update_user(user, **fields):
+    """
+    Write ``fields`` with a single UPDATE (no save() signals or field diffing)
+    and mirror them on the in-memory instance.
+
+    Only for plain columns such as timestamps. Password changes must go
+    through save() so AbstractBaseUser runs password_changed().
+    """
+    User.objects.filter(pk=user.pk).update(**fields)
+    for name, value in fields.items():
+        setattr(user, name, value)
 
 
 def _clear_jwt_cookies(response: Response):
@@ -78,9 +96,8 @@ class LoginView(APIView):
             return Response({"code": "inactive_account"}, status=status.HTTP_403_FORBIDDEN)
 
         refresh = RefreshToken.for_user(user)
-        user.last_login_at = timezone.now()
-        user.last_login = user.last_login_at
-        user.save(update_fields=["last_login_at", "last_login"])
+        now = timezone.now()
+        _update_user(user, last_login_at=now, last_login=now)
         response = Response({"user": UserSerializer(user).data})
         _set_jwt_cookies(response, refresh)
         return response
@@ -94,13 +111,13 @@ class LogoutView(APIView):
         refresh_token = request.COOKIES.get("refresh")
         if refresh_token:
             try:
-                token = RefreshToken(refresh_token)
-                token.blacklist()
+                # Revoke before responding: logout must not leave the refresh
+                # token usable, even briefly.
+                RefreshToken(refresh_token).blacklist()
             except TokenError:
                 pass
-        user = request.user
-        user.last_logout_at = timezone.now()
-        user.save(update_fields=["last_logout_at"])
+        # Audit-only column: timestamp now, write it after the response.
+        enqueue(record_logout_task, request.user.pk, timezone.now())
         response = Response(status=status.HTTP_204_NO_CONTENT)
         _clear_jwt_cookies(response)
         return response
@@ -116,7 +133,8 @@ class RefreshTokenView(APIView):
 
         try:
             token = RefreshToken(refresh_token)
-            user = User.objects.get(id=token["user_id"])
+            # RefreshToken.for_user only reads the id; skip the rest of the row.
+            user = User.objects.only("id", "is_active").get(id=token["user_id"])
         except (TokenError, User.DoesNotExist):
             return Response(status=401)
 
@@ -132,9 +150,8 @@ class PasswordResetRequestView(APIView):
     def post(self, request):
         serializer = PasswordResetRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = User.objects.get(email=serializer.validated_data["email"])
         try:
-            OTPService.issue(user, OneTimePassword.Purpose.PASSWORD_RESET)
+            OTPService.issue(serializer.user, OneTimePassword.Purpose.PASSWORD_RESET)
         except OTPServiceError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
         return Response({"detail": "Password reset OTP sent."})
@@ -147,7 +164,7 @@ class PasswordResetConfirmView(APIView):
         serializer = PasswordResetConfirmSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         try:
-            user = User.objects.get(email=serializer.validated_data["email"])
+            user = User.objects.only("id", "email", "is_active").get(email=serializer.validated_data["email"])
         except User.DoesNotExist:
             return Response({"detail": "User not found."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -179,11 +196,8 @@ class InitialSetupRequestOTPView(APIView):
         serializer = RequestInitialSetupOTPSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        email = serializer.validated_data["email"]
-        user = User.objects.get(email=email)
-
         try:
-            OTPService.issue(user, OneTimePassword.Purpose.INITIAL_SETUP)
+            OTPService.issue(serializer.user, OneTimePassword.Purpose.INITIAL_SETUP)
         except OTPServiceError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
 
@@ -207,7 +221,7 @@ class InitialSetupConfirmView(APIView):
         password = serializer.validated_data["password"]
 
         try:
-            user = User.objects.get(email=email)
+            user = User.objects.only("id", "email", "is_active").get(email=email)
         except User.DoesNotExist:
             return Response({"detail": "User not found."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -265,18 +279,29 @@ class ChangePasswordView(APIView):
         return Response({"detail": "Password updated successfully."})
 
 
-class ActivityLogView(APIView):
+class ActivityLogView(generics.ListAPIView):
     authentication_classes = [CookieJWTAuthentication]
     permission_classes = [permissions.IsAdminUser]
+    serializer_class = ActivityLogSerializer
+    pagination_class = UserPagination
 
-    def get(self, request):
-        queryset = (
+    def get_queryset(self):
+        # ActivityLogSerializer only renders local columns; no joins needed.
+        return (
             User.objects
             .filter(is_staff=False)
-            .order_by("-last_login_at")
+            .only(
+                "id",
+                "email",
+                "role",
+                "is_active",
+                "last_login_at",
+                "last_logout_at",
+                "last_password_change_at",
+                "last_password_change_reason",
+            )
+            .order_by("-last_login_at", "-id")
         )
-        data = ActivityLogSerializer(queryset, many=True).data
-        return Response(data)
 
 
 class AdminStatsView(APIView):
@@ -0,0 +1,33 @@
+"""
+Generic Django admin helpers shared by the project's apps.
+"""
+from django.contrib.admin.views.main import ChangeList
+
+
+class NarrowedChangeList(ChangeList):
+    """ChangeList that applies the model admin's changelist column narrowing."""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        qs = super().get_queryset(request, exclude_parameters)
+        admin = self.model_admin
+        if admin.changelist_only:
+            qs = qs.only(*admin.changelist_only)
+        if admin.changelist_defer:
+            qs = qs.defer(*admin.changelist_defer)
+        return qs
+
+
+class ChangelistQuerysetMixin:
+    """
+    ModelAdmin mixin that loads fewer columns on the changelist only.
+
+    ``changelist_only`` / ``changelist_defer`` are applied by the changelist
+    itself (see NarrowedChangeList), so get_object() and the change form
+    keep loading full rows.
+    """
+
+    changelist_only = ()
+    changelist_defer = ()
+
+    def get_changelist(self, request, **kwargs):
+        return NarrowedChangeList
@@ -0,0 +1,91 @@
+"""
+Generic DRF serializer helpers shared by the project's apps.
+"""
+from django.db import models
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+
+class FastListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer that resolves the child's readable fields once and
+    builds each row inline, instead of calling child.to_representation()
+    (and re-walking its fields) per instance. Output is identical.
+
+    Children that override to_representation fall back to the default path.
+    A child may define ``prefetch_for_representation(instances)`` to load
+    relations the caller did not eager-load, once for the whole list.
+    """
+
+    def to_representation(self, data):
+        child = self.child
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        prefetch = getattr(child, "prefetch_for_representation", None)
+        if prefetch is not None:
+            iterable = list(iterable)
+            prefetch(iterable)
+
+        if type(child).to_representation is not serializers.Serializer.to_representation:
+            return super().to_representation(iterable)
+
+        fields = list(child._readable_fields)
+        rows = []
+        for instance in iterable:
+            row = {}
+            for field in fields:
+                try:
+                    attribute = field.get_attribute(instance)
+                except SkipField:
+                    continue
+                check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+                row[field.field_name] = None if check_for_none is None else field.to_representation(attribute)
+            rows.append(row)
+        return rows
+
+
+class CachedBuildFieldMixin:
+    """
+    ModelSerializer mixin that memoises build_field() per serializer class.
+
+    ``Meta`` is static, so the (field_class, kwargs) recipe DRF derives from
+    model introspection is the same for every instance; only the field
+    objects themselves are rebuilt. Declared fields are still deep-copied by
+    DRF as usual.
+    """
+
+    def build_field(self, field_name, info, model_class, nested_depth):
+        cls = type(self)
+        cache = cls.__dict__.get("_build_field_cache")
+        if cache is None:
+            cache = {}
+            cls._build_field_cache = cache
+        key = (field_name, model_class, nested_depth)
+        recipe = cache.get(key)
+        if recipe is None:
+            recipe = cache[key] = super().build_field(field_name, info, model_class, nested_depth)
+        field_class, field_kwargs = recipe
+        # include_extra_kwargs() pops from the kwargs; hand out a copy.
+        return field_class, dict(field_kwargs)
+
+
+class RepresentationCacheMixin:
+    """
+    Serializer mixin that renders each (serializer class, pk) once per root
+    serializer. Meant for nested serializers of forward relations, where a
+    list repeats the same related object (e.g. one municipality under many
+    scenarios); the cached dict is shared between those rows.
+
+    The cache lives in the root's context, so it never outlives a response.
+    """
+
+    def to_representation(self, instance):
+        pk = getattr(instance, "pk", None)
+        if pk is None:
+            return super().to_representation(instance)
+        cache = self.context.setdefault("_representations", {})
+        key = (type(self), pk)
+        data = cache.get(key)
+        if data is None:
+            data = cache[key] = super().to_representation(instance)
+        return data
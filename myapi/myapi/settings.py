@@ -60,6 +60,8 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.gis',
+    # Trigram operators/lookups behind the accounts GIN trigram indexes.
+    'django.contrib.postgres',
     'channels',
 ]
 
@@ -146,6 +148,13 @@ SIMPLE_JWT = {
     'AUTH_COOKIE_HTTP_ONLY': True,
 }
 
+# Seconds a verified access token is remembered in-process by
+# CookieJWTAuthentication (0 disables the cache).
+JWT_VERIFICATION_CACHE_TTL = int(os.getenv('JWT_VERIFICATION_CACHE_TTL', '0'))
+# Seconds the authenticated user row is reused without a DB fetch. Keep it
+# short: deactivations take up to this long to apply (0 disables the cache).
+JWT_USER_CACHE_TTL = int(os.getenv('JWT_USER_CACHE_TTL', '0'))
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -235,6 +244,15 @@ SESSION_COOKIE_SECURE = os.getenv('SESSION_COOKIE_SECURE', str(not DEBUG)).lower
 
 # OSRM Configuration
 OSRM_BASE_URL = os.getenv('OSRM_BASE_URL', 'http://localhost:5000')
+# Seconds to cache OSRM distance/duration tables in the default cache; the
+# road network rarely changes between solves (0, the default, disables the
+# cache). The driving-traffic profile is never cached.
+OSRM_MATRIX_CACHE_TTL = int(os.getenv('OSRM_MATRIX_CACHE_TTL', '0'))
+# Use straight-line (haversine) tables instead of OSRM /table for plans with at
+# most this many locations, or whose points all lie within this many metres of
+# each other. 0 disables.
+OSRM_MIN_TABLE_SIZE = int(os.getenv('OSRM_MIN_TABLE_SIZE', '0'))
+OSRM_CLUSTER_RADIUS_M = float(os.getenv('OSRM_CLUSTER_RADIUS_M', '0'))
 
 if os.name == 'nt':
     
@@ -1,4 +1,6 @@
 from django.contrib import admin
+
+from common.admin import ChangelistQuerysetMixin
 from .models import (
     Bin,
     Vehicle,
@@ -39,12 +41,15 @@ class LandfillAdmin(admin.ModelAdmin):
 
 
 @admin.register(Scenario)
-class ScenarioAdmin(admin.ModelAdmin):
+class ScenarioAdmin(ChangelistQuerysetMixin, admin.ModelAdmin):
     list_display = ['name', 'municipality', 'vehicle', 'end_landfill', 'status', 'collection_date', 'created_by', 'created_at']
     list_filter = ['status', 'collection_date', 'created_at', 'municipality']
     search_fields = ['name', 'description']
     filter_horizontal = ['bins']
     readonly_fields = ['created_at', 'updated_at']
+    list_select_related = ['municipality', 'vehicle', 'end_landfill', 'created_by']
+    # description is searchable but never rendered in the list.
+    changelist_defer = ['description']
 
 
 @admin.register(ScenarioTemplate)
@@ -56,7 +61,10 @@ class ScenarioTemplateAdmin(admin.ModelAdmin):
 
 
 @admin.register(RouteSolution)
-class RouteSolutionAdmin(admin.ModelAdmin):
+class RouteSolutionAdmin(ChangelistQuerysetMixin, admin.ModelAdmin):
     list_display = ['scenario', 'total_distance', 'created_at']
     list_filter = ['created_at']
     readonly_fields = ['created_at']
+    list_select_related = ['scenario__created_by']
+    # The changelist never renders the (large) route payload.
+    changelist_defer = ['data']
@@ -1,14 +1,33 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F, Prefetch
 from django.utils import timezone
-from optimization.models import Scenario, ScenarioTemplate
+from optimization.models import Bin, Municipality, Scenario, ScenarioTemplate
 from optimization.services import VRPSolver
 
 
+# Python weekday (Mon=0 .. Sun=6) -> our system index (Sat=0 .. Fri=6).
+_PY_TO_SYSTEM_WEEKDAY = (2, 3, 4, 5, 6, 0, 1)
+
+
+def _solve(scenario_id):
+    # Runs in a worker thread, which gets its own DB connection; close it so
+    # the pool does not leak connections.
+    try:
+        return VRPSolver(scenario_id).run()
+    finally:
+        connection.close()
+
+
 class Command(BaseCommand):
     help = 'Generate daily scenarios from active recurring templates.'
 
     def add_arguments(self, parser):
         parser.add_argument('--date', type=str, help='Date in YYYY-MM-DD format to generate scenarios for.')
+        parser.add_argument('--workers', type=int, default=4, help='Number of scenarios solved concurrently.')
 
     def handle(self, *args, **options):
         date_str = options.get('date')
@@ -18,44 +37,71 @@ class Command(BaseCommand):
         else:
             today = timezone.localdate()
             
-        # Mapping Python weekday (Mon=0) to our system index (Sat=0)
-        # Mon(0)->2, Tue(1)->3, Wed(2)->4, Thu(3)->5, Fri(4)->6, Sat(5)->0, Sun(6)->1
-        weekday = str((today.weekday() + 2) % 7)
-
-        templates = ScenarioTemplate.objects.filter(is_active=True)
-        created_count = 0
+        weekday = _PY_TO_SYSTEM_WEEKDAY[today.weekday()]
 
-        for template in templates:
-            allowed_days = {d.strip() for d in template.weekdays.split(',') if d.strip()}
-            if weekday not in allowed_days:
-                continue
-
-            if Scenario.objects.filter(
-                generated_from_template=template,
+        # Only templates scheduled for today come back from the database.
+        templates = list(
+            ScenarioTemplate.objects.filter(is_active=True)
+            .alias(runs_today=F('weekdays_mask').bitand(1 << weekday))
+            .filter(runs_today__gt=0)
+            .prefetch_related(Prefetch('bins', queryset=Bin.objects.only('id')))
+        )
+        # One query for every template already generated today instead of an
+        # exists() probe per template.
+        already_generated = set(
+            Scenario.objects.filter(
                 collection_date=today,
-            ).exists():
-                continue
+                generated_from_template__in=[t.id for t in templates],
+            ).values_list('generated_from_template_id', flat=True)
+        )
+        eligible = [t for t in templates if t.id not in already_generated]
 
-            scenario = Scenario.objects.create(
+        scenarios = [
+            Scenario(
                 name=f"{template.name} - {today}",
                 description='Generated automatically from recurring template',
-                municipality=template.municipality,
-                vehicle=template.vehicle,
-                end_landfill=template.end_landfill,
+                municipality_id=template.municipality_id,
+                vehicle_id=template.vehicle_id,
+                end_landfill_id=template.end_landfill_id,
                 collection_date=today,
-                created_by=template.created_by,
+                created_by_id=template.created_by_id,
                 generated_from_template=template,
                 use_traffic_profile=template.use_traffic_profile,
                 avoid_streets=template.avoid_streets,
             )
-            scenario.bins.set(template.bins.all())
-            
-            # Trigger solver automatically for generated plans
-            try:
-                VRPSolver(scenario.id).run()
-            except Exception as e:
-                self.stderr.write(self.style.ERROR(f"Failed to solve scenario {scenario.id}: {str(e)}"))
-                
-            created_count += 1
+            for template in eligible
+        ]
+        # Two INSERTs in total: the scenarios (PKs come back on Postgres),
+        # then every scenario-bin row, taken from the prefetched template bins.
+        ScenarioBin = Scenario.bins.through
+        with transaction.atomic():
+            Scenario.objects.bulk_create(scenarios)
+            ScenarioBin.objects.bulk_create(
+                [
+                    ScenarioBin(scenario_id=scenario.id, bin_id=bin_obj.id)
+                    for scenario, template in zip(scenarios, eligible)
+                    for bin_obj in template.bins.all()
+                ],
+                batch_size=1000,
+            )
+            # Keep each municipality's scenario counter in step with the rows.
+            for municipality_id, added in Counter(s.municipality_id for s in scenarios).items():
+                Municipality.objects.filter(pk=municipality_id).update(scenario_seq=F('scenario_seq') + added)
+
+        # Trigger solver automatically for generated plans. Solves are
+        # independent and spend much of their time waiting on OSRM, so they
+        # overlap well on a small thread pool.
+        if scenarios:
+            workers = max(1, min(options['workers'], len(scenarios)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(_solve, scenario.id): scenario for scenario in scenarios}
+                for future in as_completed(futures):
+                    scenario = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self.stderr.write(self.style.ERROR(f"Failed to solve scenario {scenario.id}: {str(e)}"))
+
+        created_count = len(scenarios)
 
         self.stdout.write(self.style.SUCCESS(f'Generated {created_count} scenarios for {today}'))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-16 10:40
+
+from django.db import migrations, models
+
+
+def weekdays_to_mask(weekdays):
+    # Frozen copy of optimization.models.weekdays_to_mask as of this migration.
+    mask = 0
+    for day in weekdays.split(','):
+        day = day.strip()
+        if day.isdigit() and int(day) < 7:
+            mask |= 1 << int(day)
+    return mask
+
+
+def backfill_weekdays_mask(apps, schema_editor):
+    ScenarioTemplate = apps.get_model('optimization', 'ScenarioTemplate')
+    templates = list(ScenarioTemplate.objects.only('id', 'weekdays'))
+    for template in templates:
+        template.weekdays_mask = weekdays_to_mask(template.weekdays)
+    ScenarioTemplate.objects.bulk_update(templates, ['weekdays_mask'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('optimization', '0006_landfill_address_municipality_address'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scenariotemplate',
+            name='weekdays_mask',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_weekdays_mask, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-16 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('optimization', '0007_scenariotemplate_weekdays_mask'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scenario',
+            index=models.Index(fields=['generated_from_template', 'collection_date'], name='scenario_template_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scenario',
+            index=models.Index(fields=['municipality', 'collection_date'], name='scenario_muni_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scenario',
+            index=models.Index(fields=['status', 'collection_date'], name='scenario_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='routesolution',
+            index=models.Index(fields=['-created_at'], name='routesol_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scenariotemplate',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['is_active'], name='scentmpl_active_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-16 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('optimization', '0008_scenario_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scenario',
+            index=models.Index(fields=['-created_at'], name='scenario_created_desc'),
+        ),
+    ]
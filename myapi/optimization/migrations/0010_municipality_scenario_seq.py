@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-16 12:04
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_scenario_seq(apps, schema_editor):
+    Municipality = apps.get_model('optimization', 'Municipality')
+    municipalities = list(Municipality.objects.annotate(n=Count('scenarios')).only('id'))
+    for municipality in municipalities:
+        municipality.scenario_seq = municipality.n
+    Municipality.objects.bulk_update(municipalities, ['scenario_seq'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('optimization', '0009_scenario_created_desc'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='municipality',
+            name='scenario_seq',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_scenario_seq, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,190 @@
+# Generated by Django 5.2.8 on 2026-10-16 13:20
+
+import logging
+
+import django.contrib.gis.db.models.fields
+import django.db.models.expressions
+import django.db.models.functions.comparison
+import django.db.models.lookups
+from django.db import IntegrityError, migrations, models, transaction
+
+logger = logging.getLogger(__name__)
+
+# (table, point column, constraint prefix). Bounds are inlined rather than
+# imported from optimization.validators so replaying this migration never
+# depends on the live module.
+LOCATION_COLUMNS = [
+    ('optimization_municipality', 'hq_location', 'municipality_hq'),
+    ('optimization_landfill', 'location', 'landfill_location'),
+    ('optimization_bin', 'location', 'bin_location'),
+    ('optimization_scenario', 'start_location', 'scenario_start'),
+]
+BOUNDS = [
+    ('lat', 'ST_Y', 33.4, 33.6),
+    ('lon', 'ST_X', 36.1, 36.4),
+]
+
+
+def _constraints():
+    for table, column, prefix in LOCATION_COLUMNS:
+        for axis, function, lo, hi in BOUNDS:
+            yield table, column, f'{prefix}_{axis}_damascus', function, lo, hi
+
+
+# The constraints are added NOT VALID: new writes are checked at once, but
+# existing rows are not scanned, so the migration applies even when older
+# out-of-bounds points are still stored.
+ADD_SQL = [
+    f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" '
+    f'CHECK ({function}("{column}"::geometry) BETWEEN {lo} AND {hi}) NOT VALID'
+    for table, column, name, function, lo, hi in _constraints()
+]
+DROP_SQL = [
+    f'ALTER TABLE "{table}" DROP CONSTRAINT IF EXISTS "{name}"'
+    for table, column, name, function, lo, hi in _constraints()
+]
+
+
+def validate_constraints(apps, schema_editor):
+    """
+    VALIDATE each constraint whose table holds no out-of-bounds rows. Any
+    other stays NOT VALID (still enforced on writes) until its rows are
+    fixed and ``ALTER TABLE ... VALIDATE CONSTRAINT`` is run by hand.
+    """
+    connection = schema_editor.connection
+    for table, column, name, function, lo, hi in _constraints():
+        try:
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE "{table}" VALIDATE CONSTRAINT "{name}"')
+        except IntegrityError:
+            logger.warning('%s: existing rows are out of bounds; left NOT VALID.', name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('optimization', '0010_municipality_scenario_seq'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(ADD_SQL, reverse_sql=DROP_SQL),
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='municipality',
+                    constraint=models.CheckConstraint(
+                        condition=django.db.models.lookups.Range(
+                            django.db.models.expressions.Func(
+                                django.db.models.functions.comparison.Cast('hq_location', django.contrib.gis.db.models.fields.PointField(srid=4326)),
+                                function='ST_Y',
+                                output_field=models.FloatField(),
+                            ),
+                            (33.4, 33.6),
+                        ),
+                        name='municipality_hq_lat_damascus',
+                    ),
+                ),
+                migrations.AddConstraint(
+                    model_name='municipality',
+                    constraint=models.CheckConstraint(
+                        condition=django.db.models.lookups.Range(
+                            django.db.models.expressions.Func(
+                                django.db.models.functions.comparison.Cast('hq_location', django.contrib.gis.db.models.fields.PointField(srid=4326)),
+                                function='ST_X',
+                                output_field=models.FloatField(),
+                            ),
+                            (36.1, 36.4),
+                        ),
+                        name='municipality_hq_lon_damascus',
+                    ),
+                ),
+                migrations.AddConstraint(
+                    model_name='landfill',
+                    constraint=models.CheckConstraint(
+                        condition=django.db.models.lookups.Range(
+                            django.db.models.expressions.Func(
+                                django.db.models.functions.comparison.Cast('location', django.contrib.gis.db.models.fields.PointField(srid=4326)),
+                                function='ST_Y',
+                                output_field=models.FloatField(),
+                            ),
+                            (33.4, 33.6),
+                        ),
+                        name='landfill_location_lat_damascus',
+                    ),
+                ),
+                migrations.AddConstraint(
+                    model_name='landfill',
+                    constraint=models.CheckConstraint(
+                        condition=django.db.models.lookups.Range(
+                            django.db.models.expressions.Func(
+                                django.db.models.functions.comparison.Cast('location', django.contrib.gis.db.models.fields.PointField(srid=4326)),
+                                function='ST_X',
+                                output_field=models.FloatField(),
+                            ),
+                            (36.1, 36.4),
+                        ),
+                        name='landfill_location_lon_damascus',
+                    ),
+                ),
+                migrations.AddConstraint(
+                    model_name='bin',
+                    constraint=models.CheckConstraint(
+                        condition=django.db.models.lookups.Range(
+                            django.db.models.expressions.Func(
+                                django.db.models.functions.comparison.Cast('location', django.contrib.gis.db.models.fields.PointField(srid=4326)),
+                                function='ST_Y',
+                                output_field=models.FloatField(),
+                            ),
+                            (33.4, 33.6),
+                        ),
+                        name='bin_location_lat_damascus',
+                    ),
+                ),
+                migrations.AddConstraint(
+                    model_name='bin',
+                    constraint=models.CheckConstraint(
+                        condition=django.db.models.lookups.Range(
+                            django.db.models.expressions.Func(
+                                django.db.models.functions.comparison.Cast('location', django.contrib.gis.db.models.fields.PointField(srid=4326)),
+                                function='ST_X',
+                                output_field=models.FloatField(),
+                            ),
+                            (36.1, 36.4),
+                        ),
+                        name='bin_location_lon_damascus',
+                    ),
+                ),
+                migrations.AddConstraint(
+                    model_name='scenario',
+                    constraint=models.CheckConstraint(
+                        condition=django.db.models.lookups.Range(
+                            django.db.models.expressions.Func(
+                                django.db.models.functions.comparison.Cast('start_location', django.contrib.gis.db.models.fields.PointField(srid=4326)),
+                                function='ST_Y',
+                                output_field=models.FloatField(),
+                            ),
+                            (33.4, 33.6),
+                        ),
+                        name='scenario_start_lat_damascus',
+                    ),
+                ),
+                migrations.AddConstraint(
+                    model_name='scenario',
+                    constraint=models.CheckConstraint(
+                        condition=django.db.models.lookups.Range(
+                            django.db.models.expressions.Func(
+                                django.db.models.functions.comparison.Cast('start_location', django.contrib.gis.db.models.fields.PointField(srid=4326)),
+                                function='ST_X',
+                                output_field=models.FloatField(),
+                            ),
+                            (36.1, 36.4),
+                        ),
+                        name='scenario_start_lon_damascus',
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(validate_constraints, migrations.RunPython.noop),
+    ]
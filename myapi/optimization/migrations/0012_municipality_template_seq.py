@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-16 13:45
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_template_seq(apps, schema_editor):
+    Municipality = apps.get_model('optimization', 'Municipality')
+    municipalities = list(Municipality.objects.annotate(n=Count('scenario_templates')).only('id'))
+    for municipality in municipalities:
+        municipality.template_seq = municipality.n
+    Municipality.objects.bulk_update(municipalities, ['template_seq'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('optimization', '0011_damascus_bounds_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='municipality',
+            name='template_seq',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_template_seq, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-16 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('optimization', '0012_municipality_template_seq'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scenario',
+            index=models.Index(fields=['-collection_date', '-created_at'], name='scenario_date_created_desc'),
+        ),
+    ]
@@ -17,7 +17,11 @@ Reusable mixins for the optimization app.
 from __future__ import annotations
 
 from django.contrib.gis.geos import Point
+from django.db import IntegrityError, transaction
 from django.db.models import Q
+from rest_framework import serializers
+
+from .validators import DAMASCUS_LAT_ERROR, DAMASCUS_LON_ERROR
 
 
 # ---------------------------------------------------------------------------
@@ -39,6 +43,12 @@ class GeoPointSerializerMixin:
     Serializers with additional create/update logic (e.g. ScenarioSerializer)
     should call ``self._build_point(validated_data)`` explicitly instead of
     relying on the mixin's auto-applied create() / update().
+
+    The Damascus bounds are checked by the serializers' lat/lon field
+    validators and backed by CHECK constraints on the model (see
+    ``damascus_bounds_constraints``); save() turns a constraint violation
+    that slips past the fields into a DRF ValidationError on the matching
+    lat/lon field.
     """
 
     _lat_field: str = 'latitude'
@@ -57,6 +67,19 @@ class GeoPointSerializerMixin:
             validated_data[self._point_field] = Point(lon, lat, srid=4326)
         return validated_data
 
+    def save(self, **kwargs):
+        try:
+            # Savepoint, so a violated constraint doesn't poison an outer transaction.
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError as exc:
+            constraint = getattr(getattr(exc.__cause__, 'diag', None), 'constraint_name', None) or ''
+            if constraint.endswith('_lat_damascus'):
+                raise serializers.ValidationError({self._lat_field: [DAMASCUS_LAT_ERROR]})
+            if constraint.endswith('_lon_damascus'):
+                raise serializers.ValidationError({self._lon_field: [DAMASCUS_LON_ERROR]})
+            raise
+
     def create(self, validated_data):
         self._build_point(validated_data)
         return super().create(validated_data)
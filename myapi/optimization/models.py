@@ -1,7 +1,30 @@
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.gis.db import models
 from django.conf import settings
-from .validators import validate_damascus_latitude, validate_damascus_longitude
+from django.db.models import Func, Q
+from django.db.models.functions import Cast
+from django.db.models.lookups import Range
+from .validators import DAMASCUS_LAT_MIN, DAMASCUS_LAT_MAX, DAMASCUS_LON_MIN, DAMASCUS_LON_MAX
+
+
+def damascus_bounds_constraints(field, prefix):
+    """
+    CHECK constraints keeping the geography point ``field`` inside the
+    Damascus bounding box. Named ``<prefix>_lat_damascus`` and
+    ``<prefix>_lon_damascus`` so GeoPointSerializerMixin can map a violation
+    back to the offending coordinate. NULL points pass.
+    """
+    point = Cast(field, models.PointField(srid=4326))
+    return [
+        models.CheckConstraint(
+            condition=Range(Func(point, function='ST_Y', output_field=models.FloatField()), (DAMASCUS_LAT_MIN, DAMASCUS_LAT_MAX)),
+            name=f'{prefix}_lat_damascus',
+        ),
+        models.CheckConstraint(
+            condition=Range(Func(point, function='ST_X', output_field=models.FloatField()), (DAMASCUS_LON_MIN, DAMASCUS_LON_MAX)),
+            name=f'{prefix}_lon_damascus',
+        ),
+    ]
 
 
 class Municipality(models.Model):
@@ -18,6 +41,13 @@ class Municipality(models.Model):
         limit_choices_to={'role': 'planner'}
     )
 
+    # Auto-naming counters, not row counts: bumped only where a generated
+    # name is numbered (the serializers when no name is given, and
+    # generate_daily_scenarios). Other create paths such as the admin and
+    # create_immediate_plan leave them alone.
+    scenario_seq = models.PositiveIntegerField(default=0, editable=False)
+    template_seq = models.PositiveIntegerField(default=0, editable=False)
+
     @property
     def hq_latitude(self):
         return self.hq_location.y if self.hq_location else None
@@ -36,6 +66,7 @@ class Municipality(models.Model):
 
     class Meta:
         ordering = ['name']
+        constraints = damascus_bounds_constraints('hq_location', 'municipality_hq')
 
     def __str__(self):
         return self.name
@@ -71,6 +102,7 @@ class Landfill(models.Model):
 
     class Meta:
         ordering = ['name']
+        constraints = damascus_bounds_constraints('location', 'landfill_location')
 
     def __str__(self):
         return f"{self.name} Landfill"
@@ -123,6 +155,7 @@ class Bin(models.Model):
         indexes = [
             models.Index(fields=['is_active']),
         ]
+        constraints = damascus_bounds_constraints('location', 'bin_location')
 
     def __str__(self):
         return f"{self.name} ({self.latitude}, {self.longitude})"
@@ -235,7 +268,17 @@ class Scenario(models.Model):
         indexes = [
             # FIX: Add index for frequent date filtering
             models.Index(fields=['collection_date']),
+            # generate_daily_scenarios: templates already generated for a day.
+            models.Index(fields=['generated_from_template', 'collection_date'], name='scenario_template_date_idx'),
+            # Admin / list filters.
+            models.Index(fields=['municipality', 'collection_date'], name='scenario_muni_date_idx'),
+            models.Index(fields=['status', 'collection_date'], name='scenario_status_date_idx'),
+            # Meta.ordering: admin changelist only.
+            models.Index(fields=['-created_at'], name='scenario_created_desc'),
+            # ScenarioViewSet list ordering.
+            models.Index(fields=['-collection_date', '-created_at'], name='scenario_date_created_desc'),
         ]
+        constraints = damascus_bounds_constraints('start_location', 'scenario_start')
 
     def __str__(self):
         user_email = self.created_by.email if self.created_by else "Unknown"
@@ -264,12 +307,24 @@ class RouteSolution(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['scenario', '-created_at']),
+            # Admin changelist ordering.
+            models.Index(fields=['-created_at'], name='routesol_created_idx'),
         ]
 
     def __str__(self):
         return f"Solution for {self.scenario.name} - Distance: {self.total_distance:.2f}"
 
 
+def weekdays_to_mask(weekdays: str) -> int:
+    """Convert a comma separated weekdays string into a 7-bit mask."""
+    mask = 0
+    for day in weekdays.split(','):
+        day = day.strip()
+        if day.isdigit() and int(day) < 7:
+            mask |= 1 << int(day)
+    return mask
+
+
 class ScenarioTemplate(models.Model):
     name = models.CharField(max_length=255)
     municipality = models.ForeignKey(
@@ -292,6 +347,9 @@ class ScenarioTemplate(models.Model):
         max_length=20,
         help_text='Comma separated weekdays numbers where Monday=0 and Sunday=6',
     )
+    # Bitmask mirror of ``weekdays`` (bit n set = day n allowed) so the daily
+    # generator can filter in SQL. Maintained by save().
+    weekdays_mask = models.PositiveSmallIntegerField(default=0, editable=False)
     use_traffic_profile = models.BooleanField(default=False)
     avoid_streets = models.TextField(blank=True, default='')
     is_active = models.BooleanField(default=True)
@@ -307,6 +365,17 @@ class ScenarioTemplate(models.Model):
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            # Partial: only the active templates the daily generator scans.
+            models.Index(fields=['is_active'], name='scentmpl_active_idx', condition=Q(is_active=True)),
+        ]
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        self.weekdays_mask = weekdays_to_mask(self.weekdays)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'weekdays' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'weekdays_mask'}
+        super().save(*args, **kwargs)
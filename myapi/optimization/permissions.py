@@ -2,37 +2,36 @@ from rest_framework import permissions
 from accounts.models import User
 
 
-class IsAdmin(permissions.BasePermission):
-    """Allow only Admin role."""
+def role_required(*roles, name='RolePermission', doc=None):
+    """
+    Build a permission class that only admits authenticated users whose
+    ``role`` is one of ``roles``. The allowed roles are frozen once, at
+    import time, so each check is a single set lookup.
+    """
+    allowed = frozenset(roles)
 
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated
-            and request.user.role == User.Roles.ADMIN
-        )
+        user = request.user
+        return user.is_authenticated and user.role in allowed
 
+    return type(name, (permissions.BasePermission,), {
+        '__doc__': doc,
+        '__module__': __name__,
+        'allowed_roles': allowed,
+        'has_permission': has_permission,
+    })
 
-class IsAdminOrPlanner(permissions.BasePermission):
-    """Allow Admin or Planner roles."""
 
-    def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated
-            and request.user.role in {User.Roles.ADMIN, User.Roles.PLANNER}
-        )
+IsAdmin = role_required(User.Roles.ADMIN, name='IsAdmin', doc='Allow only Admin role.')
 
+IsAdminOrPlanner = role_required(
+    User.Roles.ADMIN, User.Roles.PLANNER,
+    name='IsAdminOrPlanner', doc='Allow Admin or Planner roles.',
+)
 
 # Backward-compatible alias — both names were in use across the codebase.
 # Prefer ``IsAdminOrPlanner`` for new code; ``IsPlannerOrAdmin`` will be
 # removed in a future clean-up pass once all call sites are migrated.
 IsPlannerOrAdmin = IsAdminOrPlanner
 
-
-class IsPlanner(permissions.BasePermission):
-    """Allow only Planner role."""
-
-    def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated
-            and request.user.role == User.Roles.PLANNER
-        )
+IsPlanner = role_required(User.Roles.PLANNER, name='IsPlanner', doc='Allow only Planner role.')
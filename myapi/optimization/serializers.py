@@ -1,11 +1,17 @@
 from datetime import timedelta
 
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib.gis.geos import Point
+from django.db import transaction
+from django.db.models import F, Prefetch, prefetch_related_objects
 from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.utils import html
 
 from accounts.models import User
+from common.serializers import CachedBuildFieldMixin, FastListSerializer, RepresentationCacheMixin
 from .models import (
     Bin,
     Vehicle,
@@ -15,57 +21,130 @@ from .models import (
     Landfill,
     ScenarioTemplate,
 )
-from .validators import (
-    DAMASCUS_LAT_MIN,
-    DAMASCUS_LAT_MAX,
-    DAMASCUS_LON_MIN,
-    DAMASCUS_LON_MAX,
-)
 from .mixins import GeoPointSerializerMixin
+from .validators import validate_damascus_latitude, validate_damascus_longitude
 
-class CreatorSerializer(serializers.ModelSerializer):
-    admin_name = serializers.CharField(source='created_by.username', read_only=True, default=None)
 
-    class Meta:
-        model = User
-        fields = ['id', 'username', 'email', 'admin_name']
+# Furthest collection date a plan may be scheduled for.
+_MAX_SCHEDULE_AHEAD = timedelta(days=180)
 
-class DamascusLocationMixin:
-    def _validate_coord(self, value, min_val, max_val, coord_name):
-        if value is not None and (value < min_val or value > max_val):
-            raise serializers.ValidationError(
-                _(f'الإحداثيات خارج حدود مدينة دمشق. {coord_name} يجب أن يكون بين {min_val} و {max_val}')
-            )
-        return value
 
-    def validate_latitude(self, value):
-        return self._validate_coord(value, DAMASCUS_LAT_MIN, DAMASCUS_LAT_MAX, "خط العرض")
-
-    def validate_longitude(self, value):
-        return self._validate_coord(value, DAMASCUS_LON_MIN, DAMASCUS_LON_MAX, "خط الطول")
-
-    def validate_hq_latitude(self, value):
-        return self.validate_latitude(value)
-
-    def validate_hq_longitude(self, value):
-        return self.validate_longitude(value)
+def _add_bins(through, owner_field, obj, bins):
+    """
+    Attach *bins* to a freshly created *obj* with one INSERT on the through
+    table. ``.set()`` would first SELECT the (necessarily empty) current rows.
+    """
+    through.objects.bulk_create(
+        [through(**{owner_field: obj.pk, 'bin_id': b.pk}) for b in bins],
+        ignore_conflicts=True,
+    )
 
-    def validate_start_latitude(self, value):
-        return self.validate_latitude(value)
 
-    def validate_start_longitude(self, value):
-        return self.validate_longitude(value)
+def _next_municipality_seq(municipality, field):
+    """
+    Atomically bump the per-municipality counter ``field`` and return the new
+    value: an O(1) UPDATE instead of COUNT(*) over the municipality's rows.
+    """
+    Municipality.objects.filter(pk=municipality.pk).update(**{field: F(field) + 1})
+    municipality.refresh_from_db(fields=[field])
+    return getattr(municipality, field)
+
+
+def _prefixed(prefix, lookups):
+    """Re-root nested serializer lookups under *prefix* (``'vehicle'`` → ``'vehicle__created_by'``)."""
+    return [f'{prefix}__{lookup}' for lookup in lookups]
+
+
+class BulkPrimaryKeyRelatedField(serializers.Field):
+    """
+    Write-only list of primary keys resolved with a single
+    ``filter(pk__in=...)`` query, instead of one ``get()`` per id as
+    ``PrimaryKeyRelatedField(many=True)`` does. Returns model instances in
+    request order (duplicates dropped), limited to the ``only`` columns.
+    """
+
+    default_error_messages = {
+        'not_a_list': _('Expected a list of items but got type "{input_type}".'),
+        'does_not_exist': _('Invalid pk "{pk_value}" - object does not exist.'),
+        'incorrect_type': _('Incorrect type. Expected pk value, received {data_type}.'),
+    }
+
+    def __init__(self, queryset, only=None, **kwargs):
+        self.queryset = queryset
+        self.only = only
+        super().__init__(**kwargs)
+
+    def get_value(self, dictionary):
+        if html.is_html_input(dictionary):
+            if self.field_name not in dictionary:
+                return empty
+            return dictionary.getlist(self.field_name)
+        return dictionary.get(self.field_name, empty)
+
+    def to_internal_value(self, data):
+        if isinstance(data, (str, dict)) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+
+        pk_field = self.queryset.model._meta.pk
+        pks = []
+        for item in data:
+            if isinstance(item, bool):
+                self.fail('incorrect_type', data_type=type(item).__name__)
+            try:
+                pks.append(pk_field.to_python(item))
+            except DjangoValidationError:
+                self.fail('incorrect_type', data_type=type(item).__name__)
+        pks = list(dict.fromkeys(pks))
+
+        queryset = self.queryset.all()
+        if self.only:
+            queryset = queryset.only(*self.only)
+        found = {obj.pk: obj for obj in queryset.filter(pk__in=pks)}
+        for pk in pks:
+            if pk not in found:
+                self.fail('does_not_exist', pk_value=pk)
+        return [found[pk] for pk in pks]
+
+    def to_representation(self, value):
+        return [obj.pk for obj in value.all()] if hasattr(value, 'all') else [obj.pk for obj in value]
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that first looks the pk up in the parent
+    serializer's ``_resolved`` map (``{(model, pk): instance}``), so objects
+    the parent has already loaded in a batch are not fetched again.
+    """
+
+    def to_internal_value(self, data):
+        resolved = getattr(self.parent, '_resolved', None)
+        if resolved and not isinstance(data, bool):
+            model = self.get_queryset().model
+            try:
+                obj = resolved.get((model, model._meta.pk.to_python(data)))
+            except DjangoValidationError:
+                obj = None
+            if obj is not None:
+                return obj
+        return super().to_internal_value(data)
+
+
+class CreatorSerializer(RepresentationCacheMixin, CachedBuildFieldMixin, serializers.ModelSerializer):
+    admin_name = serializers.CharField(source='created_by.username', read_only=True, default=None)
 
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'admin_name']
 
-class MunicipalitySerializer(DamascusLocationMixin, GeoPointSerializerMixin, serializers.ModelSerializer):
+class MunicipalitySerializer(RepresentationCacheMixin, CachedBuildFieldMixin, GeoPointSerializerMixin, serializers.ModelSerializer):
     # Override mixin defaults to match this model's field naming.
     _lat_field   = 'hq_latitude'
     _lon_field   = 'hq_longitude'
     _point_field = 'hq_location'
 
-    created_by = serializers.StringRelatedField(read_only=True)
-    hq_latitude = serializers.FloatField(required=False, allow_null=True)
-    hq_longitude = serializers.FloatField(required=False, allow_null=True)
+    created_by = serializers.CharField(source='created_by.email', read_only=True, default=None)
+    hq_latitude = serializers.FloatField(required=False, allow_null=True, validators=[validate_damascus_latitude])
+    hq_longitude = serializers.FloatField(required=False, allow_null=True, validators=[validate_damascus_longitude])
     planner = CreatorSerializer(read_only=True)
     planner_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.filter(role=User.Roles.PLANNER),
@@ -89,6 +168,13 @@ class MunicipalitySerializer(DamascusLocationMixin, GeoPointSerializerMixin, ser
         ]
         read_only_fields = ['id', 'created_by', 'planner']
 
+    # Relations read while rendering: created_by (str) and planner (+ its creator).
+    EAGER_SELECT = ('created_by', 'planner__created_by')
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related(*cls.EAGER_SELECT)
+
     def validate(self, attrs):
         """
         Admin can only assign planners they created (unless superuser).
@@ -106,34 +192,45 @@ class MunicipalitySerializer(DamascusLocationMixin, GeoPointSerializerMixin, ser
     # create() and update() are handled by GeoPointSerializerMixin ✓
 
 
-class LandfillSerializer(DamascusLocationMixin, GeoPointSerializerMixin, serializers.ModelSerializer):
+class LandfillSerializer(RepresentationCacheMixin, CachedBuildFieldMixin, GeoPointSerializerMixin, serializers.ModelSerializer):
     # Default mixin fields (latitude / longitude / location) match this model.
     municipalities = MunicipalitySerializer(many=True, read_only=True)
     municipality_ids = serializers.PrimaryKeyRelatedField(
         many=True, queryset=Municipality.objects.all(), source='municipalities',
         write_only=True, required=False,
     )
-    created_by = serializers.StringRelatedField(read_only=True)
-    latitude = serializers.FloatField(required=False, allow_null=True)
-    longitude = serializers.FloatField(required=False, allow_null=True)
+    created_by = serializers.CharField(source='created_by.email', read_only=True, default=None)
+    latitude = serializers.FloatField(required=False, allow_null=True, validators=[validate_damascus_latitude])
+    longitude = serializers.FloatField(required=False, allow_null=True, validators=[validate_damascus_longitude])
 
     class Meta:
         model = Landfill
         fields = ['id', 'name', 'address', 'latitude', 'longitude', 'municipalities', 'municipality_ids', 'created_by']
         read_only_fields = ['id', 'created_by']
+
+    EAGER_SELECT = ('created_by',)
+
+    @classmethod
+    def municipalities_prefetch(cls, prefix=''):
+        lookup = f'{prefix}__municipalities' if prefix else 'municipalities'
+        return Prefetch(lookup, queryset=MunicipalitySerializer.setup_eager_loading(Municipality.objects.all()))
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related(*cls.EAGER_SELECT).prefetch_related(cls.municipalities_prefetch())
     # create() and update() are handled by GeoPointSerializerMixin ✓
 
 
-class BinSerializer(DamascusLocationMixin, GeoPointSerializerMixin, serializers.ModelSerializer):
+class BinSerializer(GeoPointSerializerMixin, serializers.ModelSerializer):
     # Default mixin fields (latitude / longitude / location) match this model.
     municipality = MunicipalitySerializer(read_only=True)
     municipality_id = serializers.PrimaryKeyRelatedField(
         queryset=Municipality.objects.all(), source='municipality',
         write_only=True,
     )
-    created_by = serializers.StringRelatedField(read_only=True)
-    latitude = serializers.FloatField(required=False)
-    longitude = serializers.FloatField(required=False)
+    created_by = serializers.CharField(source='created_by.email', read_only=True, default=None)
+    latitude = serializers.FloatField(required=False, validators=[validate_damascus_latitude])
+    longitude = serializers.FloatField(required=False, validators=[validate_damascus_longitude])
 
     class Meta:
         model = Bin
@@ -141,10 +238,17 @@ class BinSerializer(DamascusLocationMixin, GeoPointSerializerMixin, serializers.
                   'pickup_window_start', 'pickup_window_end',
                   'municipality', 'municipality_id', 'created_at', 'updated_at', 'created_by']
         read_only_fields = ['id', 'created_at', 'updated_at', 'created_by']
+        list_serializer_class = FastListSerializer
+
+    EAGER_SELECT = ('created_by', 'municipality', *_prefixed('municipality', MunicipalitySerializer.EAGER_SELECT))
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related(*cls.EAGER_SELECT)
     # create() and update() are handled by GeoPointSerializerMixin ✓
 
 
-class BinAvailableSerializer(serializers.ModelSerializer):
+class BinAvailableSerializer(CachedBuildFieldMixin, serializers.ModelSerializer):
     latitude = serializers.ReadOnlyField()
     longitude = serializers.ReadOnlyField()
 
@@ -152,50 +256,77 @@ class BinAvailableSerializer(serializers.ModelSerializer):
         model = Bin
         fields = ['id', 'name', 'address', 'latitude', 'longitude', 'capacity', 'pickup_window_start', 'pickup_window_end']
         read_only_fields = ['id']
+        list_serializer_class = FastListSerializer
 
+    # Columns backing the fields above (latitude/longitude come from location).
+    ONLY = ('id', 'name', 'address', 'location', 'capacity', 'pickup_window_start', 'pickup_window_end')
 
-class VehicleSerializer(serializers.ModelSerializer):
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.only(*cls.ONLY)
+
+
+class VehicleSerializer(RepresentationCacheMixin, CachedBuildFieldMixin, serializers.ModelSerializer):
     municipality = MunicipalitySerializer(read_only=True)
     municipality_id = serializers.PrimaryKeyRelatedField(
         queryset=Municipality.objects.all(), source='municipality',
         write_only=True,
     )
 
-    created_by = serializers.StringRelatedField(read_only=True)
+    created_by = serializers.CharField(source='created_by.email', read_only=True, default=None)
 
     class Meta:
         model = Vehicle
         fields = ['id', 'name', 'capacity', 'municipality', 'municipality_id', 'created_at', 'updated_at', 'created_by']
         read_only_fields = ['id', 'created_at', 'updated_at', 'created_by']
 
+    EAGER_SELECT = ('created_by', 'municipality', *_prefixed('municipality', MunicipalitySerializer.EAGER_SELECT))
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related(*cls.EAGER_SELECT)
 
-class RouteSolutionSlimSerializer(serializers.ModelSerializer):
+
+class RouteSolutionSlimSerializer(CachedBuildFieldMixin, serializers.ModelSerializer):
     class Meta:
         model = RouteSolution
         fields = ['id', 'total_distance', 'total_time', 'co2_kg', 'created_at']
         read_only_fields = ['id', 'created_at']
+        list_serializer_class = FastListSerializer
+
+    # Leaves out the (multi-KB) ``data`` JSON; scenario_id is needed to attach
+    # the prefetched rows to their scenario.
+    ONLY = ('id', 'scenario_id', 'total_distance', 'total_time', 'co2_kg', 'created_at')
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.only(*cls.ONLY).order_by('-created_at')
 
-class ScenarioSerializer(DamascusLocationMixin, GeoPointSerializerMixin, serializers.ModelSerializer):
+
+class ScenarioSerializer(CachedBuildFieldMixin, GeoPointSerializerMixin, serializers.ModelSerializer):
     # Override mixin defaults to match Scenario's start-location field names.
     _lat_field   = 'start_latitude'
     _lon_field   = 'start_longitude'
     _point_field = 'start_location'
 
     municipality = MunicipalitySerializer(read_only=True)
-    municipality_id = serializers.PrimaryKeyRelatedField(queryset=Municipality.objects.all(), source='municipality', write_only=True)
+    municipality_id = PreloadedPrimaryKeyRelatedField(queryset=Municipality.objects.all(), source='municipality', write_only=True)
     vehicle = VehicleSerializer(read_only=True)
-    vehicle_id = serializers.PrimaryKeyRelatedField(queryset=Vehicle.objects.all(), source='vehicle', write_only=True)
+    vehicle_id = PreloadedPrimaryKeyRelatedField(queryset=Vehicle.objects.all(), source='vehicle', write_only=True)
     end_landfill = LandfillSerializer(read_only=True)
     end_landfill_id = serializers.PrimaryKeyRelatedField(queryset=Landfill.objects.all(), source='end_landfill', write_only=True)
-    bins = BinSerializer(many=True, read_only=True)
-    bin_ids = serializers.PrimaryKeyRelatedField(many=True, queryset=Bin.objects.all(), source='bins', write_only=True)
+    # Slim nested representation; the full bin is available from /bins/.
+    bins = BinAvailableSerializer(many=True, read_only=True)
+    bin_ids = BulkPrimaryKeyRelatedField(
+        queryset=Bin.objects.all(), source='bins', write_only=True,
+        only=('id', 'name', 'is_active', 'municipality_id'),
+    )
     created_by = CreatorSerializer(read_only=True)
     solutions = RouteSolutionSlimSerializer(many=True, read_only=True)
     is_expired = serializers.SerializerMethodField()
     name = serializers.CharField(required=False, allow_blank=True)
-    start_latitude = serializers.FloatField(required=False, allow_null=True)
-    start_longitude = serializers.FloatField(required=False, allow_null=True)
+    start_latitude = serializers.FloatField(required=False, allow_null=True, validators=[validate_damascus_latitude])
+    start_longitude = serializers.FloatField(required=False, allow_null=True, validators=[validate_damascus_longitude])
 
     class Meta:
         model = Scenario
@@ -208,15 +339,79 @@ class ScenarioSerializer(DamascusLocationMixin, GeoPointSerializerMixin, seriali
             'is_expired', 'created_at', 'updated_at',
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'is_expired']
+        list_serializer_class = FastListSerializer
+
+    EAGER_SELECT = (
+        'created_by__created_by',
+        'municipality', *_prefixed('municipality', MunicipalitySerializer.EAGER_SELECT),
+        'vehicle', *_prefixed('vehicle', VehicleSerializer.EAGER_SELECT),
+        'end_landfill', *_prefixed('end_landfill', LandfillSerializer.EAGER_SELECT),
+    )
+
+    @classmethod
+    def prefetch_lookups(cls):
+        return [
+            Prefetch('bins', queryset=BinAvailableSerializer.setup_eager_loading(Bin.objects.all())),
+            LandfillSerializer.municipalities_prefetch('end_landfill'),
+            Prefetch('solutions', queryset=RouteSolutionSlimSerializer.setup_eager_loading(RouteSolution.objects.all())),
+        ]
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load every relation the nested serializers render in a constant number of queries."""
+        return queryset.select_related(*cls.EAGER_SELECT).prefetch_related(*cls.prefetch_lookups())
+
+    @classmethod
+    def prefetch_for_representation(cls, instances):
+        """
+        Load whatever the caller did not eager-load (admin, commands, freshly
+        saved instances) in one query per relation; relations that are
+        already cached are skipped, so eager-loaded querysets cost nothing.
+        """
+        prefetch_related_objects(instances, *cls.EAGER_SELECT, *cls.prefetch_lookups())
+
+    @property
+    def data(self):
+        # Single-instance path; lists go through FastListSerializer's hook.
+        if not hasattr(self, '_data') and isinstance(self.instance, Scenario):
+            self.prefetch_for_representation([self.instance])
+        return super().data
+
+    def to_internal_value(self, data):
+        # A plan's vehicle belongs to the plan's municipality, so load the
+        # vehicle together with its municipality in one query; vehicle_id,
+        # municipality_id and the HQ fallback in validate() all reuse it.
+        self._resolved = {}
+        vehicle_id = data.get('vehicle_id') if hasattr(data, 'get') else None
+        if vehicle_id not in (None, '') and not isinstance(vehicle_id, bool):
+            try:
+                vehicle = Vehicle.objects.select_related('municipality').filter(pk=vehicle_id).first()
+            except (TypeError, ValueError, DjangoValidationError):
+                vehicle = None
+            if vehicle is not None:
+                self._resolved[(Vehicle, vehicle.pk)] = vehicle
+                self._resolved[(Municipality, vehicle.municipality_id)] = vehicle.municipality
+        return super().to_internal_value(data)
+
+    def _today(self):
+        # One timezone.localdate() per request, shared through the root context.
+        today = self.context.get('_today')
+        if today is None:
+            today = self.context.setdefault('_today', timezone.localdate())
+        return today
 
     def get_is_expired(self, obj):
-        return obj.collection_date < timezone.localdate()
+        # Annotated in SQL by ScenarioViewSet; freshly saved instances fall back to Python.
+        expired = getattr(obj, 'is_expired', None)
+        if expired is None:
+            expired = obj.collection_date < self._today()
+        return expired
 
     def validate_collection_date(self, value):
-        today = timezone.localdate()
+        today = self._today()
         if value < today:
             raise serializers.ValidationError(_('لا يمكن تحديد تاريخ في الماضي.'))
-        if value > today + timedelta(days=180):
+        if value > today + _MAX_SCHEDULE_AHEAD:
             raise serializers.ValidationError(_('يمكن تحديد موعد ضمن ستة أشهر فقط.'))
         return value
 
@@ -244,15 +439,21 @@ class ScenarioSerializer(DamascusLocationMixin, GeoPointSerializerMixin, seriali
 
         collection_date = attrs.get('collection_date') or getattr(self.instance, 'collection_date', None)
         if vehicle and collection_date:
-            exclude_args = {'pk': self.instance.pk} if self.instance else {}
-            in_use = Scenario.objects.filter(vehicle=vehicle, collection_date=collection_date).exclude(**exclude_args).exists()
-            if in_use:
+            # The only conflict query on a scenario write; served by the
+            # (vehicle_id) FK index and answered with LIMIT 1.
+            in_use = Scenario.objects.filter(vehicle_id=vehicle.pk, collection_date=collection_date)
+            if self.instance is not None:
+                in_use = in_use.exclude(pk=self.instance.pk)
+            if in_use.exists():
                 raise serializers.ValidationError({'vehicle': _('المركبة مستخدمة في خطة أخرى في نفس التاريخ.')})
 
         start_lat = attrs.get('start_latitude')
         start_lon = attrs.get('start_longitude')
         if vehicle and start_lat is None:
-            start_lat, start_lon = vehicle.municipality.hq_latitude, vehicle.municipality.hq_longitude
+            # validate() has already checked the vehicle belongs to the plan's
+            # municipality, so reuse that object rather than loading vehicle.municipality.
+            hq = municipality if municipality is not None and municipality.pk == vehicle.municipality_id else vehicle.municipality
+            start_lat, start_lon = hq.hq_latitude, hq.hq_longitude
             if start_lat is None or start_lon is None:
                 raise serializers.ValidationError({'vehicle': _('بلدية المركبة لا تملك إحداثيات مركز (HQ).')})
 
@@ -263,8 +464,8 @@ class ScenarioSerializer(DamascusLocationMixin, GeoPointSerializerMixin, seriali
     def _auto_name(self, municipality, provided_name: str) -> str:
         if provided_name:
             return provided_name
-        count = Scenario.objects.filter(municipality=municipality).count() + 1
-        return f"خطة {count} – منطقة {municipality.name}"
+        seq = _next_municipality_seq(municipality, 'scenario_seq')
+        return f"خطة {seq} – منطقة {municipality.name}"
 
     def create(self, validated_data):
         bins = validated_data.pop('bins')
@@ -276,7 +477,7 @@ class ScenarioSerializer(DamascusLocationMixin, GeoPointSerializerMixin, seriali
         validated_data['created_by'] = self.context['request'].user
 
         scenario = Scenario.objects.create(**validated_data)
-        scenario.bins.set(bins)
+        _add_bins(Scenario.bins.through, 'scenario_id', scenario, bins)
         return scenario
 
     def update(self, instance, validated_data):
@@ -284,6 +485,8 @@ class ScenarioSerializer(DamascusLocationMixin, GeoPointSerializerMixin, seriali
         self._build_point(validated_data)
         if self._point_field in validated_data:
             instance.start_location = validated_data.pop(self._point_field)
+        # The queryset annotation reflects the old collection_date.
+        instance.__dict__.pop('is_expired', None)
         return super().update(instance, validated_data)
 
 
@@ -295,7 +498,10 @@ class ScenarioTemplateSerializer(serializers.ModelSerializer):
     end_landfill = LandfillSerializer(read_only=True)
     end_landfill_id = serializers.PrimaryKeyRelatedField(queryset=Landfill.objects.all(), source='end_landfill', write_only=True)
     bins = BinSerializer(many=True, read_only=True)
-    bin_ids = serializers.PrimaryKeyRelatedField(many=True, queryset=Bin.objects.all(), source='bins', write_only=True)
+    bin_ids = BulkPrimaryKeyRelatedField(
+        queryset=Bin.objects.all(), source='bins', write_only=True,
+        only=('id', 'name', 'is_active', 'municipality_id'),
+    )
     created_by = CreatorSerializer(read_only=True)
     name = serializers.CharField(required=False, allow_blank=True)
 
@@ -309,6 +515,18 @@ class ScenarioTemplateSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'created_by']
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related(
+            'created_by__created_by',
+            'municipality', *_prefixed('municipality', MunicipalitySerializer.EAGER_SELECT),
+            'vehicle', *_prefixed('vehicle', VehicleSerializer.EAGER_SELECT),
+            'end_landfill', *_prefixed('end_landfill', LandfillSerializer.EAGER_SELECT),
+        ).prefetch_related(
+            Prefetch('bins', queryset=BinSerializer.setup_eager_loading(Bin.objects.all())),
+            LandfillSerializer.municipalities_prefetch('end_landfill'),
+        )
+
     def validate(self, attrs):
         municipality = attrs.get('municipality')
         vehicle = attrs.get('vehicle')
@@ -324,9 +542,10 @@ class ScenarioTemplateSerializer(serializers.ModelSerializer):
     def _auto_name(self, municipality, provided_name: str) -> str:
         if provided_name:
             return provided_name
-        count = ScenarioTemplate.objects.filter(municipality=municipality).count() + 1
-        return f"قالب {count} – منطقة {municipality.name}"
+        seq = _next_municipality_seq(municipality, 'template_seq')
+        return f"قالب {seq} – منطقة {municipality.name}"
 
+    @transaction.atomic
     def create(self, validated_data):
         bins = validated_data.pop('bins')
         municipality = validated_data.get('municipality')
@@ -334,7 +553,7 @@ class ScenarioTemplateSerializer(serializers.ModelSerializer):
         # request will be passed in context from ViewSet
         validated_data['created_by'] = self.context['request'].user
         template = ScenarioTemplate.objects.create(**validated_data)
-        template.bins.set(bins)
+        _add_bins(ScenarioTemplate.bins.through, 'scenariotemplate_id', template, bins)
         return template
 
 
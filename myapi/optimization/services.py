@@ -1,71 +1,182 @@
+import hashlib
+import json
 import logging
 import math
-from typing import List, Tuple, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple, Dict, Any
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.contrib.gis.db.models import PointField
+from django.db.models import FloatField, Func
+from django.db.models.functions import Cast
 from ortools.constraint_solver import routing_enums_pb2, pywrapcp
-from .models import Scenario, RouteSolution
+from .models import Bin, Scenario, RouteSolution
 
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_M = 6371000.0
+
+# One HTTP session per thread (Session is not thread-safe and
+# generate_daily_scenarios solves on a thread pool), all mounted on a single
+# adapter so keep-alive connections to OSRM are pooled process-wide: a thread
+# picks up a warm connection another thread released. pool_maxsize covers
+# request threads plus the OSRM and daily-generation worker pools.
+_local = threading.local()
+_osrm_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+
+# OSRM calls are pure network I/O; independent ones (route geometries) are
+# overlapped here.
+_osrm_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='osrm')
+
+
+def _osrm_session() -> requests.Session:
+    session = getattr(_local, 'osrm_session', None)
+    if session is None:
+        session = _local.osrm_session = requests.Session()
+        session.mount('http://', _osrm_adapter)
+        session.mount('https://', _osrm_adapter)
+    return session
+
+
+def haversine_matrix(locations: List[Tuple[float, float]]) -> np.ndarray:
+    """Great-circle distances in metres between every pair of (lat, lon)."""
+    coords = np.radians(np.asarray(locations, dtype=np.float64).reshape(-1, 2))
+    lat = coords[:, 0:1]
+    lon = coords[:, 1:2]
+    a = (
+        np.sin((lat - lat.T) / 2) ** 2
+        + np.cos(lat) * np.cos(lat.T) * np.sin((lon - lon.T) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
 
 class OSRMService:
     BASE_URL = getattr(settings, 'OSRM_BASE_URL', 'http://localhost:5000')
+    # Assumed average speed (~30 km/h) for pairs OSRM cannot route.
+    FALLBACK_SPEED_MPS = 30 / 3.6
+    MATRIX_CACHE_TTL = getattr(settings, 'OSRM_MATRIX_CACHE_TTL', 0)
+    # Live-traffic durations go stale within minutes; never serve them from cache.
+    UNCACHED_PROFILES = frozenset({'driving-traffic'})
+    # Straight-line tables, skipping the /table request, for plans of at most
+    # this many locations or whose points all lie within this radius (m) of
+    # each other. 0 disables either shortcut.
+    MIN_TABLE_SIZE = getattr(settings, 'OSRM_MIN_TABLE_SIZE', 0)
+    CLUSTER_RADIUS_M = getattr(settings, 'OSRM_CLUSTER_RADIUS_M', 0)
+
+    @staticmethod
+    def _coordinates(locations) -> str:
+        # 6 decimals (~11 cm) is ample for routing and keeps float repr noise
+        # out of the URL.
+        return ";".join([f"{lon:.6f},{lat:.6f}" for lat, lon in locations])
 
     @classmethod
-    def get_distance_matrix(cls, locations: List[Tuple[float, float]], profile: str = 'driving', exclude: str = '') -> List[List[int]]:
+    def _table_keys(cls, locations, profile, exclude):
+        """Cache keys for the tables of ``locations`` and the sorted order they are stored in."""
+        coords = np.asarray(locations, dtype=np.float64).reshape(-1, 2)
+        order = np.lexsort((coords[:, 1], coords[:, 0]))
+        fingerprint = json.dumps([profile, exclude, coords[order].round(6).tolist()])
+        digest = hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest()
+        return {name: f'osrm:{name}:{digest}' for name in ('distance', 'duration')}, order
+
+    @classmethod
+    def get_matrices(cls, locations: List[Tuple[float, float]], profile: str = 'driving', exclude: str = '') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Distance (m) and duration (s) tables for ``locations`` as contiguous
+        integer arrays, from a single OSRM /table request (both annotations)
+        or the cache.
+
+        Small or tightly clustered plans (see MIN_TABLE_SIZE and
+        CLUSTER_RADIUS_M) get straight-line tables without calling OSRM.
+
+        With OSRM_MATRIX_CACHE_TTL set, tables for non-traffic profiles are
+        cached as int32 in a canonical (sorted) location order, so the same
+        set of points is a hit whatever order it is requested in; rows and
+        columns are permuted back to the caller's order on the way out.
+        """
         if not locations:
-            return []
-        coordinates = ";".join([f"{lon},{lat}" for lat, lon in locations])
-        url = f"{cls.BASE_URL}/table/v1/{profile}/{coordinates}"
-        params = {"annotations": "distance"}
-        if exclude:
-            params['exclude'] = exclude
-        try:
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-        except requests.RequestException as e:
-            logger.error(f"OSRM Connection Error: {e}")
-            raise ValidationError("فشل الاتصال بخدمة الخرائط.") from e
+            empty = np.zeros((0, 0), dtype=np.int64)
+            return empty, empty
+        if len(locations) <= cls.MIN_TABLE_SIZE:
+            return cls._haversine_tables(locations)
+        if cls.CLUSTER_RADIUS_M:
+            distance = haversine_matrix(locations)
+            if distance.max() <= cls.CLUSTER_RADIUS_M:
+                return cls._haversine_tables(locations, distance)
+        if not cls.MATRIX_CACHE_TTL or profile in cls.UNCACHED_PROFILES:
+            tables = cls._fetch_tables(locations, profile, exclude)
+        else:
+            keys, order = cls._table_keys(locations, profile, exclude)
+            cached = cache.get_many(keys.values())
+            if len(cached) == len(keys):
+                inverse = np.argsort(order)
+                tables = {name: cached[key][np.ix_(inverse, inverse)] for name, key in keys.items()}
+            else:
+                tables = cls._fetch_tables(locations, profile, exclude)
+                cache.set_many(
+                    {key: tables[name].astype(np.int32)[np.ix_(order, order)] for name, key in keys.items()},
+                    cls.MATRIX_CACHE_TTL,
+                )
+        return tables['distance'], tables['duration']
 
-        if "distances" not in data:
-            raise ValidationError("استجابة غير صالحة من خدمة الخرائط.")
-        return cls._sanitize_matrix(data["distances"], len(locations))
+    @classmethod
+    def _haversine_tables(cls, locations, distance=None) -> Tuple[np.ndarray, np.ndarray]:
+        if distance is None:
+            distance = haversine_matrix(locations)
+        return (
+            np.rint(distance).astype(np.int64),
+            np.rint(distance / cls.FALLBACK_SPEED_MPS).astype(np.int64),
+        )
+
+    @classmethod
+    def get_distance_matrix(cls, locations: List[Tuple[float, float]], profile: str = 'driving', exclude: str = '') -> List[List[int]]:
+        return cls.get_matrices(locations, profile, exclude)[0].tolist()
 
     @classmethod
     def get_duration_matrix(cls, locations: List[Tuple[float, float]], profile: str = 'driving', exclude: str = '') -> List[List[int]]:
-        if not locations:
-            return []
-        coordinates = ";".join([f"{lon},{lat}" for lat, lon in locations])
+        return cls.get_matrices(locations, profile, exclude)[1].tolist()
+
+    @classmethod
+    def _fetch_tables(cls, locations, profile, exclude) -> Dict[str, np.ndarray]:
+        coordinates = cls._coordinates(locations)
         url = f"{cls.BASE_URL}/table/v1/{profile}/{coordinates}"
-        params = {"annotations": "duration"}
+        # One request for both tables: OSRM snaps the points and searches the
+        # graph once instead of twice.
+        params = {"annotations": "distance,duration"}
         if exclude:
             params['exclude'] = exclude
         try:
-            response = requests.get(url, params=params, timeout=5)
+            response = _osrm_session().get(url, params=params, timeout=5)
             response.raise_for_status()
-            data = response.json()
-        except requests.RequestException as e:
+            # Parse the raw bytes: skips requests' text decoding/charset guess
+            # on what can be a multi-MB table.
+            data = json.loads(response.content)
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"OSRM Connection Error: {e}")
             raise ValidationError("فشل الاتصال بخدمة الخرائط.") from e
 
-        if "durations" not in data:
+        if "distances" not in data or "durations" not in data:
             raise ValidationError("استجابة غير صالحة من خدمة الخرائط.")
-        return cls._sanitize_matrix(data["durations"], len(locations))
+        return {
+            'distance': cls._sanitize_matrix(data["distances"], locations),
+            'duration': cls._sanitize_matrix(data["durations"], locations, speed=cls.FALLBACK_SPEED_MPS),
+        }
 
     @classmethod
     def get_route_geometry(cls, locations: List[Tuple[float, float]], profile: str = 'driving', exclude: str = '') -> str:
         if not locations:
             return ""
-        coordinates = ";".join([f"{lon},{lat}" for lat, lon in locations])
+        coordinates = cls._coordinates(locations)
         url = f"{cls.BASE_URL}/route/v1/{profile}/{coordinates}"
         params = {"overview": "full", "geometries": "polyline", "steps": "false"}
         if exclude:
             params['exclude'] = exclude
         try:
-            response = requests.get(url, params=params, timeout=5)
+            response = _osrm_session().get(url, params=params, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if data.get("routes"):
@@ -75,23 +186,57 @@ class OSRMService:
         return ""
 
     @staticmethod
-    def _sanitize_matrix(raw_distances, expected_size) -> List[List[int]]:
-        matrix = []
-        for row in raw_distances:
-            if len(row) != expected_size:
-                raise ValidationError("عدم تطابق في أبعاد مصفوفة المسافات.")
-            matrix.append([int(round(d)) for d in row])
-        return matrix
+    def _sanitize_matrix(raw_distances, locations, speed=None) -> np.ndarray:
+        """
+        Round an OSRM table to ints. Cells OSRM could not route (null) are
+        filled from the straight-line distance, divided by ``speed`` (m/s)
+        when the table holds durations.
+        """
+        # One vectorised conversion instead of an int(round()) per cell;
+        # np.rint rounds half to even exactly like round().
+        expected_size = len(locations)
+        try:
+            matrix = np.asarray(raw_distances, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValidationError("عدم تطابق في أبعاد مصفوفة المسافات.")
+        if matrix.shape != (expected_size, expected_size):
+            raise ValidationError("عدم تطابق في أبعاد مصفوفة المسافات.")
+
+        missing = ~np.isfinite(matrix)
+        if missing.any():
+            logger.warning("OSRM could not route %d pairs; using haversine estimates.", int(missing.sum()))
+            fallback = haversine_matrix(locations)
+            if speed:
+                fallback /= speed
+            matrix[missing] = fallback[missing]
+        # Stays an ndarray; nested lists are only built at the OR-Tools boundary.
+        return np.rint(matrix).astype(np.int64)
 
 
 class VRPSolver:
     """
     Hybrid TSP+VRP approach:
     - TSP-style initial route construction (PATH_CHEAPEST_ARC)
-    - VRP local improvement (GUIDED_LOCAL_SEARCH)
+    - VRP local improvement (GUIDED_LOCAL_SEARCH; plain local search for small instances)
     - Open route: starts at municipality HQ and ends at scenario end_landfill
     """
 
+    # Search time limit (seconds) by problem size: (max locations, seconds).
+    # Small instances converge long before the full budget; past the tiers
+    # the budget grows by a second per 10 locations, capped at MAX.
+    TIME_LIMIT_TIERS = ((10, 2), (25, 5))
+    BASE_TIME_LIMIT = 10
+    MAX_TIME_LIMIT = 60
+    # Below this many locations, skip the metaheuristic: local search from
+    # PATH_CHEAPEST_ARC reaches its optimum in milliseconds and then stops,
+    # whereas guided local search always runs out the time limit.
+    SMALL_PROBLEM_SIZE = 20
+    # A single-vehicle plan is an open TSP; descent stays adequate for longer.
+    SINGLE_VEHICLE_DESCENT_MAX_BINS = 30
+    # From this many locations on, seed the search with a greedy
+    # nearest-neighbour plan instead of building one with PATH_CHEAPEST_ARC.
+    WARM_START_MIN_SIZE = 100
+
     def __init__(self, scenario_id: int):
         self.scenario_id = scenario_id
         self.scenario = None
@@ -100,12 +245,13 @@ class VRPSolver:
         self.start_location = None
         self.end_location = None
         self.locations = []
-        self.distance_matrix = []
-        self.duration_matrix = []
+        self.distance_matrix = None
+        self.duration_matrix = None
 
         self.manager = None
         self.routing = None
         self.solution = None
+        self.time_limit = self.BASE_TIME_LIMIT
 
     def run(self) -> Dict[str, Any]:
         self._load_data()
@@ -120,11 +266,23 @@ class VRPSolver:
         try:
             self.scenario = Scenario.objects.select_related(
                 'vehicle', 'vehicle__municipality', 'end_landfill'
-            ).prefetch_related('bins').get(pk=self.scenario_id)
+            ).get(pk=self.scenario_id)
         except Scenario.DoesNotExist:
             raise ObjectDoesNotExist(f"الخطة رقم {self.scenario_id} غير موجودة.")
 
-        self.bins = list(self.scenario.bins.filter(is_active=True))
+        # Bins are only read, never saved: fetch plain rows with the
+        # coordinates extracted by PostGIS, so no model instance or GEOS
+        # point is built per bin.
+        point = Cast('location', PointField(srid=4326))
+        self.bins = list(
+            Bin.objects.filter(scenarios=self.scenario, is_active=True).annotate(
+                latitude=Func(point, function='ST_Y', output_field=FloatField()),
+                longitude=Func(point, function='ST_X', output_field=FloatField()),
+            ).values_list(
+                'id', 'latitude', 'longitude', 'capacity', 'pickup_window_start', 'pickup_window_end',
+                named=True,
+            )
+        )
         self.vehicle = self.scenario.vehicle
 
     def _validate_requirements(self):
@@ -155,8 +313,9 @@ class VRPSolver:
     def _fetch_matrix(self):
         profile = 'driving-traffic' if self.scenario.use_traffic_profile else 'driving'
         exclude = self.scenario.avoid_streets
-        self.distance_matrix = OSRMService.get_distance_matrix(self.locations, profile=profile, exclude=exclude)
-        self.duration_matrix = OSRMService.get_duration_matrix(self.locations, profile=profile, exclude=exclude)
+        self.distance_matrix, self.duration_matrix = OSRMService.get_matrices(
+            self.locations, profile=profile, exclude=exclude,
+        )
 
     def _setup_routing_model(self):
         total_bin_demand = sum(b.capacity for b in self.bins)
@@ -169,30 +328,20 @@ class VRPSolver:
         )
         self.routing = pywrapcp.RoutingModel(self.manager)
 
-        def distance_callback(from_index: int, to_index: int) -> int:
-            from_node = self.manager.IndexToNode(from_index)
-            to_node = self.manager.IndexToNode(to_index)
-            return self.distance_matrix[from_node][to_node]
-
-        transit_index = self.routing.RegisterTransitCallback(distance_callback)
+        # Matrices and vectors are handed to OR-Tools once and looked up in C++,
+        # instead of calling back into Python for every arc the search tries.
+        transit_index = self.routing.RegisterTransitMatrix(self.distance_matrix.tolist())
         self.routing.SetArcCostEvaluatorOfAllVehicles(transit_index)
 
-        def demand_callback(from_index: int) -> int:
-            node = self.manager.IndexToNode(from_index)
-            if node in (0, len(self.locations) - 1):
-                return 0
-            return self.bins[node - 1].capacity
-
-        demand_index = self.routing.RegisterUnaryTransitCallback(demand_callback)
+        demands = [0] + [b.capacity for b in self.bins] + [0]
+        demand_index = self.routing.RegisterUnaryTransitVector(demands)
         self.routing.AddDimension(demand_index, 0, self.vehicle.capacity, True, 'Capacity')
 
-        def time_callback(from_index: int, to_index: int) -> int:
-            from_node = self.manager.IndexToNode(from_index)
-            to_node = self.manager.IndexToNode(to_index)
-            service_time = 180 if from_node != 0 and from_node != len(self.locations) - 1 else 0
-            return int(self.duration_matrix[from_node][to_node]) + service_time
-
-        time_callback_index = self.routing.RegisterTransitCallback(time_callback)
+        # Travel time plus the service time spent at the bin being left.
+        service_times = np.full(len(self.locations), 180, dtype=np.int64)
+        service_times[[0, -1]] = 0
+        time_matrix = self.duration_matrix + service_times[:, None]
+        time_callback_index = self.routing.RegisterTransitMatrix(time_matrix.tolist())
         self.routing.AddDimension(
             time_callback_index,
             3600,
@@ -219,13 +368,70 @@ class VRPSolver:
     def _solve(self):
         p = pywrapcp.DefaultRoutingSearchParameters()
         p.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
-        p.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
-        p.time_limit.seconds = 10
 
-        self.solution = self.routing.SolveWithParameters(p)
+        n = len(self.locations)
+        single_vehicle_tsp = (
+            self.manager.GetNumberOfVehicles() == 1
+            and len(self.bins) <= self.SINGLE_VEHICLE_DESCENT_MAX_BINS
+        )
+        if n < self.SMALL_PROBLEM_SIZE or single_vehicle_tsp:
+            p.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GREEDY_DESCENT
+        else:
+            p.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+        self.time_limit = self._time_limit(n)
+        p.time_limit.seconds = self.time_limit
+        p.log_search = settings.DEBUG
+
+        initial = None
+        if n >= self.WARM_START_MIN_SIZE:
+            routes = self._nearest_neighbor_routes()
+            if routes is not None:
+                # None if the greedy plan breaks a time window; fall back then.
+                initial = self.routing.ReadAssignmentFromRoutes(routes, True)
+        if initial is not None:
+            self.solution = self.routing.SolveFromAssignmentWithParameters(initial, p)
+        else:
+            self.solution = self.routing.SolveWithParameters(p)
         if not self.solution:
             raise ValidationError("لم يتم العثور على حل ممكن لهذه الخطة (قد تكون السعة غير كافية).")
 
+    def _time_limit(self, n: int) -> int:
+        for size, limit in self.TIME_LIMIT_TIERS:
+            if n < size:
+                return limit
+        return min(self.MAX_TIME_LIMIT, max(self.BASE_TIME_LIMIT, n // 10))
+
+    def _nearest_neighbor_routes(self) -> Optional[List[List[int]]]:
+        """
+        Greedy capacity-aware plan: each vehicle repeatedly drives to the
+        nearest unvisited bin that still fits, then heads to the landfill.
+        Returns routing indices per vehicle, or None if the bins do not fit
+        in the available vehicles.
+        """
+        num_vehicles = self.manager.GetNumberOfVehicles()
+        demands = np.array([b.capacity for b in self.bins], dtype=np.int64)
+        # Rows from the start and every bin, columns to the bins only.
+        distances = self.distance_matrix[:-1, 1:-1].astype(np.float64)
+        unvisited = np.ones(len(self.bins), dtype=bool)
+        routes = []
+        for _ in range(num_vehicles):
+            route = []
+            current = 0
+            remaining = self.vehicle.capacity
+            while True:
+                candidates = unvisited & (demands <= remaining)
+                if not candidates.any():
+                    break
+                nxt = int(np.argmin(np.where(candidates, distances[current], np.inf)))
+                unvisited[nxt] = False
+                remaining -= demands[nxt]
+                route.append(self.manager.NodeToIndex(nxt + 1))
+                current = nxt + 1
+            routes.append(route)
+        if unvisited.any():
+            return None
+        return routes
+
     def _save_solution(self) -> Dict[str, Any]:
         routes_data = []
         total_distance = 0
@@ -273,7 +479,11 @@ class VRPSolver:
             
             profile = 'driving-traffic' if self.scenario.use_traffic_profile else 'driving'
             exclude = self.scenario.avoid_streets
-            geometry = OSRMService.get_route_geometry(route_coords, profile=profile, exclude=exclude) if route_stops else ""
+            # Routes are independent; fetch their geometries concurrently and
+            # fill them in once the loop is done.
+            geometry = _osrm_executor.submit(
+                OSRMService.get_route_geometry, route_coords, profile=profile, exclude=exclude,
+            )
             
             total_distance += route_distance
             route_time = self.solution.Min(time_dimension.CumulVar(self.routing.End(vehicle_id)))
@@ -295,6 +505,8 @@ class VRPSolver:
 
         if not routes_data:
             raise ValidationError("لم يتم إنشاء مسارات صالحة (قد تكون المشكلة في سعة المركبة).")
+        for route in routes_data:
+            route['geometry'] = route['geometry'].result()
 
         total_km = total_distance / 1000.0
         FUEL_LITRES_PER_KM = 0.30
@@ -308,7 +520,7 @@ class VRPSolver:
             'total_distance': total_km,
             'routes': routes_data,
             'solver_mode': 'hybrid_tsp_vrp',
-            'time_limit_seconds': 10,
+            'time_limit_seconds': self.time_limit,
             'kpis': {
                 'total_km': round(total_km, 2),
                 'total_time_seconds': round(total_time_seconds, 2),
@@ -326,8 +538,10 @@ class VRPSolver:
             co2_kg=co2_kg,
             data=result_data
         )
-        result_data['solution_id'] = solution_obj.id
-        return result_data
+        # solution_id belongs to the response only. A shallow copy keeps
+        # solution_obj.data identical to the stored row; writing the id into
+        # the JSON too would cost a second UPDATE that re-encodes the routes.
+        return {**result_data, 'solution_id': solution_obj.id}
 
 
 def solve_vrp(scenario_id: int) -> Dict[str, Any]:
@@ -1,3 +1,231 @@
-from django.test import TestCase
+from collections import namedtuple
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.contrib.gis.geos import Point
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from ortools.constraint_solver import pywrapcp
+from rest_framework import serializers
+
+from .mixins import GeoPointSerializerMixin
+from .models import Bin, Municipality
+from .serializers import BinSerializer, BulkPrimaryKeyRelatedField, LandfillSerializer
+from .services import OSRMService, VRPSolver
+from .validators import DAMASCUS_LAT_ERROR, DAMASCUS_LON_ERROR
+
+
+def _point(lat, lon):
+    return Point(lon, lat, srid=4326)
+
+
+class BulkPrimaryKeyRelatedFieldTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.municipality = Municipality.objects.create(name='Test municipality', hq_location=_point(33.51, 36.29))
+        cls.bins = [
+            Bin.objects.create(
+                name=f'Bin {i}', location=_point(33.50 + i / 1000, 36.30), capacity=240,
+                municipality=cls.municipality,
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.field = BulkPrimaryKeyRelatedField(queryset=Bin.objects.all(), only=('id', 'name'))
+
+    def _codes(self, data):
+        with self.assertRaises(serializers.ValidationError) as ctx:
+            self.field.to_internal_value(data)
+        return ctx.exception.get_codes()
+
+    def test_resolves_all_pks_in_one_query_in_request_order(self):
+        a, b, c = self.bins
+        with self.assertNumQueries(1):
+            resolved = self.field.to_internal_value([c.pk, str(a.pk), c.pk, b.pk])
+        self.assertEqual([obj.pk for obj in resolved], [c.pk, a.pk, b.pk])
+
+    def test_only_loads_the_requested_columns(self):
+        resolved = self.field.to_internal_value([self.bins[0].pk])
+        self.assertIn('location', resolved[0].get_deferred_fields())
+        self.assertNotIn('name', resolved[0].get_deferred_fields())
+
+    def test_unknown_pk_is_rejected(self):
+        missing = max(b.pk for b in self.bins) + 1
+        self.assertEqual(self._codes([self.bins[0].pk, missing]), ['does_not_exist'])
+
+    def test_non_list_input_is_rejected(self):
+        self.assertEqual(self._codes('1,2'), ['not_a_list'])
+        self.assertEqual(self._codes({'id': 1}), ['not_a_list'])
+        self.assertEqual(self._codes(1), ['not_a_list'])
+
+    def test_invalid_pk_types_are_rejected(self):
+        self.assertEqual(self._codes([True]), ['incorrect_type'])
+        self.assertEqual(self._codes(['abc']), ['incorrect_type'])
+
+
+# Deliberately out of sorted order, so the cache's canonical order differs
+# from the request order.
+LOCATIONS = [(33.52, 36.31), (33.50, 36.28), (33.55, 36.25), (33.50, 36.20)]
+
+
+def _fake_tables(locations, profile, exclude):
+    """Asymmetric tables derived from the points themselves, not their positions."""
+    keys = np.array([LOCATIONS.index(tuple(loc)) + 1 for loc in locations], dtype=np.int64)
+    distance = keys[:, None] * 100 + keys[None, :]
+    return {'distance': distance, 'duration': distance * 2}
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class OSRMMatrixCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        for name, value in (('MATRIX_CACHE_TTL', 60), ('MIN_TABLE_SIZE', 0), ('CLUSTER_RADIUS_M', 0)):
+            patcher = mock.patch.object(OSRMService, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(OSRMService, '_fetch_tables', side_effect=_fake_tables)
+        self.fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertTables(self, locations, tables):
+        expected = _fake_tables(locations, 'driving', '')
+        np.testing.assert_array_equal(tables[0], expected['distance'])
+        np.testing.assert_array_equal(tables[1], expected['duration'])
+
+    def test_hit_in_another_order_is_permuted_back(self):
+        self.assertTables(LOCATIONS, OSRMService.get_matrices(LOCATIONS))
+
+        for order in ([2, 0, 3, 1], [3, 2, 1, 0], [1, 3, 0, 2]):
+            locations = [LOCATIONS[i] for i in order]
+            self.assertTables(locations, OSRMService.get_matrices(locations))
+        self.fetch.assert_called_once()
+
+    def test_profile_and_exclude_are_part_of_the_key(self):
+        OSRMService.get_matrices(LOCATIONS)
+        OSRMService.get_matrices(LOCATIONS, profile='driving', exclude='motorway')
+        OSRMService.get_matrices(LOCATIONS, profile='walking')
+        self.assertEqual(self.fetch.call_count, 3)
+
+    def test_traffic_profile_is_never_cached(self):
+        OSRMService.get_matrices(LOCATIONS, profile='driving-traffic')
+        OSRMService.get_matrices(LOCATIONS, profile='driving-traffic')
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_zero_ttl_disables_the_cache(self):
+        with mock.patch.object(OSRMService, 'MATRIX_CACHE_TTL', 0):
+            OSRMService.get_matrices(LOCATIONS)
+            OSRMService.get_matrices(LOCATIONS)
+        self.assertEqual(self.fetch.call_count, 2)
+
+
+def _violation(constraint):
+    exc = IntegrityError('new row violates check constraint')
+    exc.__cause__ = SimpleNamespace(diag=SimpleNamespace(constraint_name=constraint))
+    return exc
+
+
+class _RaisingSave:
+    error = None
+
+    def save(self, **kwargs):
+        raise self.error
+
+
+class _HQSerializer(GeoPointSerializerMixin, _RaisingSave):
+    _lat_field = 'hq_latitude'
+    _lon_field = 'hq_longitude'
+
+
+class DamascusBoundsTests(TestCase):
+    def _save_error(self, error):
+        serializer = _HQSerializer()
+        serializer.error = error
+        with self.assertRaises(serializers.ValidationError) as ctx:
+            serializer.save()
+        return ctx.exception.detail
+
+    def test_constraint_violations_map_to_the_lat_lon_fields(self):
+        self.assertEqual(self._save_error(_violation('municipality_hq_lat_damascus')), {'hq_latitude': [DAMASCUS_LAT_ERROR]})
+        self.assertEqual(self._save_error(_violation('municipality_hq_lon_damascus')), {'hq_longitude': [DAMASCUS_LON_ERROR]})
+
+    def test_other_integrity_errors_propagate(self):
+        serializer = _HQSerializer()
+        serializer.error = _violation('optimization_municipality_name_key')
+        with self.assertRaises(IntegrityError):
+            serializer.save()
+
+    def test_database_rejects_out_of_bounds_points(self):
+        municipality = Municipality.objects.create(name='Bounds municipality')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Bin.objects.create(name='Far bin', location=_point(35.0, 36.30), capacity=240, municipality=municipality)
+
+    def test_serializer_fields_reject_out_of_bounds_coordinates(self):
+        serializer = BinSerializer(data={'latitude': 35.0, 'longitude': 38.0})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['latitude'], [DAMASCUS_LAT_ERROR])
+        self.assertEqual(serializer.errors['longitude'], [DAMASCUS_LON_ERROR])
+
+    def test_constraint_violation_past_the_fields_becomes_a_validation_error(self):
+        serializer = LandfillSerializer(data={'name': 'Landfill', 'latitude': 33.45, 'longitude': 36.20})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        # Simulate a write path that skipped the field validators.
+        serializer.validated_data['latitude'] = 35.0
+
+        with self.assertRaises(serializers.ValidationError) as ctx:
+            serializer.save()
+        self.assertEqual(ctx.exception.detail, {'latitude': [DAMASCUS_LAT_ERROR]})
+
+
+BinRow = namedtuple('BinRow', 'id capacity pickup_window_start pickup_window_end')
+
+
+class NearestNeighborWarmStartTests(SimpleTestCase):
+    # Points on a line: the start at 0, bins at 3, 1 and 2, the landfill at 10.
+    POSITIONS = [0, 3, 1, 2, 10]
+
+    def _solver(self, capacities, vehicle_capacity, num_vehicles):
+        solver = VRPSolver(scenario_id=0)
+        solver.bins = [BinRow(i + 1, capacity, None, None) for i, capacity in enumerate(capacities)]
+        solver.vehicle = SimpleNamespace(capacity=vehicle_capacity)
+        positions = np.array(self.POSITIONS, dtype=np.int64)
+        solver.locations = [(33.5, 36.3)] * len(positions)
+        solver.distance_matrix = np.abs(positions[:, None] - positions[None, :]) * 1000
+        solver.duration_matrix = solver.distance_matrix // 10
+        n = len(positions)
+        solver.manager = pywrapcp.RoutingIndexManager(n, num_vehicles, [0] * num_vehicles, [n - 1] * num_vehicles)
+        return solver
+
+    def _nodes(self, solver, routes):
+        return [[solver.manager.IndexToNode(index) for index in route] for route in routes]
+
+    def test_single_vehicle_visits_the_nearest_bin_next(self):
+        solver = self._solver([240, 240, 240], vehicle_capacity=1000, num_vehicles=1)
+        self.assertEqual(self._nodes(solver, solver._nearest_neighbor_routes()), [[2, 3, 1]])
+
+    def test_vehicles_split_by_capacity(self):
+        solver = self._solver([600, 600, 600], vehicle_capacity=1000, num_vehicles=3)
+        self.assertEqual(self._nodes(solver, solver._nearest_neighbor_routes()), [[2], [3], [1]])
+
+    def test_no_plan_when_bins_do_not_fit(self):
+        solver = self._solver([600, 600, 600], vehicle_capacity=1000, num_vehicles=2)
+        self.assertIsNone(solver._nearest_neighbor_routes())
+
+    def test_solve_from_the_warm_start_visits_every_bin(self):
+        solver = self._solver([240, 240, 240], vehicle_capacity=1000, num_vehicles=1)
+        solver._setup_routing_model()
+        with mock.patch.object(VRPSolver, 'WARM_START_MIN_SIZE', 0), \
+                mock.patch.object(VRPSolver, '_nearest_neighbor_routes', autospec=True,
+                                  side_effect=VRPSolver._nearest_neighbor_routes) as warm_start:
+            solver._solve()
+        warm_start.assert_called_once()
+
+        visited = []
+        index = solver.routing.Start(0)
+        while not solver.routing.IsEnd(index):
+            index = solver.solution.Value(solver.routing.NextVar(index))
+            if not solver.routing.IsEnd(index):
+                visited.append(solver.manager.IndexToNode(index))
+        self.assertEqual(sorted(visited), [1, 2, 3])
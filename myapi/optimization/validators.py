@@ -7,21 +7,18 @@ DAMASCUS_LAT_MAX = 33.60
 DAMASCUS_LON_MIN = 36.10
 DAMASCUS_LON_MAX = 36.40
 
+# Messages are static, so format them once.
+DAMASCUS_LAT_ERROR = f'الإحداثيات خارج حدود مدينة دمشق. خط العرض يجب أن يكون بين {DAMASCUS_LAT_MIN} و {DAMASCUS_LAT_MAX}'
+DAMASCUS_LON_ERROR = f'الإحداثيات خارج حدود مدينة دمشق. خط الطول يجب أن يكون بين {DAMASCUS_LON_MIN} و {DAMASCUS_LON_MAX}'
+
 
 def validate_damascus_latitude(value):
     """Validate that latitude is within Damascus bounds."""
-    if value is not None:
-        if value < DAMASCUS_LAT_MIN or value > DAMASCUS_LAT_MAX:
-            raise ValidationError(
-                f'الإحداثيات خارج حدود مدينة دمشق. خط العرض يجب أن يكون بين {DAMASCUS_LAT_MIN} و {DAMASCUS_LAT_MAX}'
-            )
+    if value is not None and not (DAMASCUS_LAT_MIN <= value <= DAMASCUS_LAT_MAX):
+        raise ValidationError(DAMASCUS_LAT_ERROR)
 
 
 def validate_damascus_longitude(value):
     """Validate that longitude is within Damascus bounds."""
-    if value is not None:
-        if value < DAMASCUS_LON_MIN or value > DAMASCUS_LON_MAX:
-            raise ValidationError(
-                f'الإحداثيات خارج حدود مدينة دمشق. خط الطول يجب أن يكون بين {DAMASCUS_LON_MIN} و {DAMASCUS_LON_MAX}'
-            )
-
+    if value is not None and not (DAMASCUS_LON_MIN <= value <= DAMASCUS_LON_MAX):
+        raise ValidationError(DAMASCUS_LON_ERROR)
@@ -1,8 +1,11 @@
 from datetime import timedelta, datetime
 import logging
 
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q, Value
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from rest_framework import viewsets, status, permissions
 from rest_framework.exceptions import ValidationError as DRFValidationError
@@ -60,7 +63,7 @@ class BinViewSet(CreatorScopedViewSetMixin, viewsets.ModelViewSet):
         municipality_id = self.request.query_params.get('municipality')
         if municipality_id:
             qs = qs.filter(municipality_id=municipality_id)
-        return qs
+        return BinSerializer.setup_eager_loading(qs)
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -100,7 +103,7 @@ class MunicipalityViewSet(CreatorScopedViewSetMixin, viewsets.ModelViewSet):
 
 
 class LandfillViewSet(CreatorScopedViewSetMixin, viewsets.ModelViewSet):
-    queryset = Landfill.objects.all().prefetch_related('municipalities')
+    queryset = Landfill.objects.all()
     serializer_class = LandfillSerializer
     permission_classes = [IsAdmin]
     pagination_class = OptimizationPagination
@@ -122,7 +125,7 @@ class LandfillViewSet(CreatorScopedViewSetMixin, viewsets.ModelViewSet):
         municipality_id = self.request.query_params.get('municipality')
         if municipality_id:
             qs = qs.filter(municipalities__id=municipality_id)
-        return qs
+        return LandfillSerializer.setup_eager_loading(qs)
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -162,7 +165,7 @@ class VehicleViewSet(CreatorScopedViewSetMixin, viewsets.ModelViewSet):
         if municipality_id:
             qs = qs.filter(municipality_id=municipality_id)
 
-        return qs.distinct()
+        return VehicleSerializer.setup_eager_loading(qs.distinct())
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -178,7 +181,7 @@ class ScenarioTemplateViewSet(CreatorScopedViewSetMixin, viewsets.ModelViewSet):
         return [IsPlanner()] # Admin is Read-Only for plans
 
     def get_queryset(self):
-        qs = ScenarioTemplate.objects.select_related('municipality', 'vehicle', 'end_landfill')
+        qs = ScenarioTemplateSerializer.setup_eager_loading(ScenarioTemplate.objects.all())
         qs = self.scope_by_creator(qs)
 
         # For planners, restrict to their assigned municipalities
@@ -203,21 +206,45 @@ class ScenarioTemplateViewSet(CreatorScopedViewSetMixin, viewsets.ModelViewSet):
 
 
 class ScenarioViewSet(CreatorScopedViewSetMixin, viewsets.ModelViewSet):
+    """
+    ``?compact=true`` on the list action returns flat rows straight from
+    ``values()`` (ids, names and ``bin_ids``) without the nested serializers.
+    """
     serializer_class = ScenarioSerializer
     pagination_class = OptimizationPagination
 
+    COMPACT_FIELDS = (
+        'id', 'name', 'collection_date', 'status',
+        'municipality_id', 'municipality__name',
+        'vehicle_id', 'vehicle__name',
+        'end_landfill_id', 'end_landfill__name',
+        'created_at',
+    )
+
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
             return [IsPlannerOrAdmin()]
         return [IsPlanner()] # Admin is Read-Only for plans
 
+    @cached_property
+    def today(self):
+        return timezone.localdate()
+
+    def get_serializer_context(self):
+        # Share the request's "today" with the serializer so validation and the
+        # is_expired fallback agree with the annotation (and skip recomputing it).
+        context = super().get_serializer_context()
+        context['_today'] = self.today
+        return context
+
     def get_queryset(self):
         user = self.request.user
-        today = timezone.localdate()
+        today = self.today
 
-        qs = Scenario.objects.select_related(
-            'created_by', 'vehicle', 'municipality', 'end_landfill'
-        ).prefetch_related('bins')
+        qs = ScenarioSerializer.setup_eager_loading(Scenario.objects.all()).annotate(
+            # Read by ScenarioSerializer.get_is_expired.
+            is_expired=ExpressionWrapper(Q(collection_date__lt=today), output_field=BooleanField()),
+        )
 
         qs = self.scope_by_creator(qs)
 
@@ -257,6 +284,35 @@ class ScenarioViewSet(CreatorScopedViewSetMixin, viewsets.ModelViewSet):
 
         return qs.order_by('-collection_date', '-created_at')
 
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('compact') != 'true':
+            # Page over the bare scenario rows; the serializer's
+            # prefetch_for_representation() then loads the forward relations
+            # for that page only: one IN (...) query per relation, with shared
+            # creators/municipalities fetched once instead of joined per row.
+            qs = self.filter_queryset(self.get_queryset()).select_related(None)
+            page = self.paginate_queryset(qs)
+            serializer = self.get_serializer(page if page is not None else qs, many=True)
+            if page is not None:
+                return self.get_paginated_response(serializer.data)
+            return Response(serializer.data)
+
+        qs = (
+            self.filter_queryset(self.get_queryset())
+            .prefetch_related(None)
+            .values(*self.COMPACT_FIELDS)
+            .annotate(bin_ids=ArrayAgg('bins__id', filter=Q(bins__isnull=False), default=Value([])))
+        )
+        page = self.paginate_queryset(qs)
+        rows = list(page if page is not None else qs)
+        for row in rows:
+            row['municipality_name'] = row.pop('municipality__name')
+            row['vehicle_name'] = row.pop('vehicle__name')
+            row['end_landfill_name'] = row.pop('end_landfill__name')
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
+
     def perform_create(self, serializer):
         serializer.save()
 
@@ -302,16 +358,20 @@ class AvailableBinList(APIView):
         municipality_id = request.query_params.get('municipality')
         today = timezone.localdate()
 
-        busy_qs = Scenario.objects.filter(collection_date__gte=today)
+        # Correlated NOT EXISTS on the through table: the planner can stop at
+        # the first upcoming assignment per bin, and no DISTINCT is needed
+        # because each bin row is only ever returned once.
+        busy = Scenario.bins.through.objects.filter(
+            bin_id=OuterRef('pk'), scenario__collection_date__gte=today,
+        )
         if scenario_id:
-            busy_qs = busy_qs.exclude(id=scenario_id)
+            busy = busy.exclude(scenario_id=scenario_id)
 
-        busy_bin_ids = busy_qs.values_list('bins__id', flat=True)
-        qs = Bin.objects.filter(is_active=True).exclude(id__in=busy_bin_ids)
+        qs = Bin.objects.filter(is_active=True).filter(~Exists(busy))
         if municipality_id:
             qs = qs.filter(municipality_id=municipality_id)
 
-        return Response(BinAvailableSerializer(qs.distinct(), many=True).data)
+        return Response(BinAvailableSerializer(qs, many=True).data)
 
 
 class RouteSolutionListView(APIView):
@@ -1,5 +1,6 @@
 import logging
 
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils.translation import gettext_lazy as _
 from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
@@ -14,6 +15,7 @@ from .throttles import DeviceAndIPRateThrottle
 from accounts.models import Notification, User
 from accounts.serializers import NotificationSerializer
 from optimization.models import Scenario, Bin
+from optimization.validators import validate_damascus_latitude, validate_damascus_longitude
 from datetime import date
 
 logger = logging.getLogger(__name__)
@@ -246,6 +248,14 @@ class AdminBinRequestViewSet(
             else:
                 location = bin_req.report.location
 
+            # Citizen reports are not bounds-checked; catch an out-of-area
+            # point here rather than as a CHECK-constraint IntegrityError.
+            try:
+                validate_damascus_latitude(location.y)
+                validate_damascus_longitude(location.x)
+            except DjangoValidationError as exc:
+                return Response({"error": exc.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+
             new_bin = Bin.objects.create(
                 name=new_name,
                 location=location,